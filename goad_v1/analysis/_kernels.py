@@ -0,0 +1,72 @@
+"""
+Numerical kernels for structure analysis in GOAD v1.0
+
+Compiled with Numba when it is installed, plain NumPy otherwise
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _cluster_z_numpy(sorted_z: np.ndarray, tol: float):
+    """NumPy version of cluster_z"""
+    starts = np.concatenate(([0], np.nonzero(np.diff(sorted_z) > tol)[0] + 1))
+    ends = np.append(starts[1:], len(sorted_z))
+    means = np.add.reduceat(sorted_z, starts) / (ends - starts)
+    return starts, ends, means
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _cluster_z_numba(sorted_z, tol):
+        """Numba version of cluster_z (single pass over sorted_z)"""
+        n = sorted_z.shape[0]
+        starts = np.empty(n, np.int64)
+        ends = np.empty(n, np.int64)
+        means = np.empty(n, np.float64)
+
+        n_layers = 0
+        start = 0
+        total = sorted_z[0]
+        for i in range(1, n):
+            if sorted_z[i] - sorted_z[i - 1] > tol:
+                starts[n_layers] = start
+                ends[n_layers] = i
+                means[n_layers] = total / (i - start)
+                n_layers += 1
+                start = i
+                total = 0.0
+            total += sorted_z[i]
+
+        starts[n_layers] = start
+        ends[n_layers] = n
+        means[n_layers] = total / (n - start)
+        n_layers += 1
+
+        return starts[:n_layers].copy(), ends[:n_layers].copy(), means[:n_layers].copy()
+
+
+def cluster_z(sorted_z: np.ndarray, tol: float):
+    """
+    Group sorted z-coordinates into layers.
+
+    A new layer starts wherever the gap to the previous coordinate
+    exceeds the tolerance.
+
+    Args:
+        sorted_z: Non-empty array of z-coordinates in ascending order
+        tol: Maximum gap (Angstrom) between atoms of the same layer
+
+    Returns:
+        Tuple of (starts, ends, means): slice bounds into sorted_z and
+        mean z of each layer, from bottom to top
+    """
+    sorted_z = np.ascontiguousarray(sorted_z, dtype=np.float64)
+    if HAS_NUMBA:
+        return _cluster_z_numba(sorted_z, float(tol))
+    return _cluster_z_numpy(sorted_z, tol)
@@ -12,6 +12,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Standard atomic masses (amu) indexed by atomic number
+_MASS_BY_Z = np.asarray(atomic_masses, dtype=np.float64)
+
 
 class MoleculeAnalyzer:
     """Analyze molecule structure and properties"""
@@ -25,6 +28,8 @@ class MoleculeAnalyzer:
         """
         self.molecule = molecule
         self._info = None
+        self._info_version = 0  # Bumped by every analyze()
+        self._info_text = None  # (version, text) of the last get_info_text()
 
     def analyze(self) -> Dict:
         """
@@ -46,45 +51,25 @@ class MoleculeAnalyzer:
         }
 
         self._info = info
+        self._info_version += 1
         return info
 
     def _get_formula(self) -> str:
         """Get molecular formula"""
-        symbols = self.molecule.get_chemical_symbols()
-        composition = {}
-
-        for symbol in symbols:
-            composition[symbol] = composition.get(symbol, 0) + 1
-
-        # Format formula
-        formula = ""
-        for element in sorted(composition.keys()):
-            count = composition[element]
-            if count == 1:
-                formula += element
-            else:
-                formula += f"{element}{count}"
-
-        return formula
+        # Composition is already sorted by element symbol
+        return "".join(
+            element if count == 1 else f"{element}{count}"
+            for element, count in self._get_composition().items()
+        )
 
     def _get_composition(self) -> Dict[str, int]:
         """Get element composition"""
-        composition = {}
-        for symbol in self.molecule.get_chemical_symbols():
-            composition[symbol] = composition.get(symbol, 0) + 1
-        return composition
+        symbols, counts = np.unique(self.molecule.get_chemical_symbols(), return_counts=True)
+        return dict(zip(symbols.tolist(), counts.tolist()))
 
     def _get_mass(self) -> float:
         """Get molecular mass in amu"""
-        from ase.data import atomic_numbers
-
-        symbols = self.molecule.get_chemical_symbols()
-        mass = 0
-        for symbol in symbols:
-            # Get atomic number from symbol, then get mass
-            atomic_num = atomic_numbers[symbol]
-            mass += atomic_masses[atomic_num]
-        return mass
+        return float(_MASS_BY_Z[self.molecule.numbers].sum())
 
     def _categorize_size(self) -> str:
         """Categorize molecule size"""
@@ -103,13 +88,8 @@ class MoleculeAnalyzer:
 
     def _get_dimensions(self) -> Dict[str, float]:
         """Get molecular dimensions"""
-        positions = self.molecule.get_positions()
-
-        return {
-            "x": positions[:, 0].max() - positions[:, 0].min(),
-            "y": positions[:, 1].max() - positions[:, 1].min(),
-            "z": positions[:, 2].max() - positions[:, 2].min(),
-        }
+        dx, dy, dz = np.ptp(self.molecule.get_positions(), axis=0)
+        return {"x": dx, "y": dy, "z": dz}
 
     def _get_center_of_mass(self) -> np.ndarray:
         """Get center of mass"""
@@ -125,6 +105,9 @@ class MoleculeAnalyzer:
         if not self._info:
             return "No analysis performed"
 
+        if self._info_text is not None and self._info_text[0] == self._info_version:
+            return self._info_text[1]
+
         info = self._info
         text = "=" * 60 + "\n"
         text += "MOLECULE INFORMATION\n"
@@ -151,4 +134,5 @@ class MoleculeAnalyzer:
         text += f"  Y: {com[1]:.2f} Å\n"
         text += f"  Z: {com[2]:.2f} Å\n"
 
+        self._info_text = (self._info_version, text)
         return text
@@ -4,12 +4,15 @@ Surface type detection and analysis for GOAD v1.0
 Identifies slab vs porous structures and analyzes layer properties
 """
 
+from functools import cached_property
+
 import numpy as np
 from ase import Atoms
-from ase.geometry import get_distances
 from typing import Dict, List, Tuple, Optional
 import logging
 
+from ._kernels import cluster_z
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,10 +30,29 @@ class SurfaceAnalyzer:
         self.surface = surface
         self.vacuum_threshold = vacuum_threshold
         self._info = None
+        self._info_version = 0  # Bumped by every analyze()
+        self._info_text = None  # (version, text) of the last get_info_text()
         self.surface_type = None
         self.n_layers = None
+        self.layers_list = []
         self.layer_heights = None
 
+    @cached_property
+    def _positions(self) -> np.ndarray:
+        """Atomic positions, read once from the surface"""
+        return self.surface.get_positions()
+
+    @cached_property
+    def _z_coords(self) -> np.ndarray:
+        """Z coordinates of all atoms"""
+        return self._positions[:, 2]
+
+    @cached_property
+    def _layer_index_map(self) -> Dict[int, np.ndarray]:
+        """Map layer number to its sorted atom indices"""
+        layers = self._info.get('layers', {}).get('layers_list', [])
+        return {layer['layer_number']: layer['atom_indices'] for layer in layers}
+
     def analyze(self) -> Dict:
         """
         Perform complete surface analysis.
@@ -40,6 +62,10 @@ class SurfaceAnalyzer:
         """
         logger.info("Analyzing surface structure...")
 
+        # Re-read the coordinates, the surface may have moved or been replaced
+        self.__dict__.pop('_positions', None)
+        self.__dict__.pop('_z_coords', None)
+
         # Detect surface type
         self._detect_surface_type()
 
@@ -55,15 +81,21 @@ class SurfaceAnalyzer:
         # If slab, analyze layers
         if self.surface_type == "slab":
             info["layers"] = self._analyze_layers()
+            self.layers_list = info["layers"]["layers_list"]
+            self.n_layers = info["layers"]["n_layers"]
         else:
             info["message"] = "Porous structures (MOF/Zeolite) are under development"
+            self.layers_list = []
+            self.n_layers = 0
 
         self._info = info
+        self._info_version += 1
+        self.__dict__.pop('_layer_index_map', None)
         return info
 
     def _detect_surface_type(self) -> None:
         """Detect if surface is slab or porous"""
-        z_coords = self.surface.get_positions()[:, 2]
+        z_coords = self._z_coords
         z_min = z_coords.min()
         z_max = z_coords.max()
         z_range = z_max - z_min
@@ -92,34 +124,17 @@ class SurfaceAnalyzer:
         Returns:
             Dictionary with layer information
         """
-        positions = self.surface.get_positions()
-        z_coords = positions[:, 2]
-
-        n_atoms = len(z_coords)
-
-        # Cluster z-coordinates into layers
-        z_unique = []
+        z_coords = self._z_coords
         z_tolerance = 0.3  # Atoms within 0.3 Å are in same layer
 
-        # Get sorted indices
+        # Sort atoms by height and start a new layer wherever the gap
+        # to the next atom exceeds the tolerance
         sorted_indices = np.argsort(z_coords)
-        sorted_z = z_coords[sorted_indices]
-
-        # Cluster atoms by z-coordinate
-        layer_z_values = []
-        for z in sorted_z:
-            # Check if z belongs to existing cluster
-            belongs_to_layer = False
-            for z_ref in layer_z_values:
-                if abs(z - z_ref) < z_tolerance:
-                    belongs_to_layer = True
-                    break
-
-            if not belongs_to_layer:
-                layer_z_values.append(z)
-
-        # Sort z-values from top to bottom (highest Z first)
-        layer_z_values = sorted(layer_z_values, reverse=True)
+        starts, ends, layer_means = cluster_z(z_coords[sorted_indices], z_tolerance)
+
+        # Sort layers from top to bottom (highest Z first)
+        layer_groups = [sorted_indices[s:e] for s, e in zip(starts[::-1], ends[::-1])]
+        layer_z_values = layer_means[::-1].tolist()
         n_layers = len(layer_z_values)
 
         logger.info(f"  Detected {n_layers} atomic layers")
@@ -133,38 +148,25 @@ class SurfaceAnalyzer:
             "layers_list": []
         }
 
-        # Assign atoms to layers
-        for layer_idx, z_ref in enumerate(layer_z_values):
-            layer_atoms = []
-
-            for atom_idx in range(n_atoms):
-                if abs(z_coords[atom_idx] - z_ref) < z_tolerance:
-                    layer_atoms.append(atom_idx)
-
+        for layer_idx, (z_ref, layer_atoms) in enumerate(zip(layer_z_values, layer_groups)):
             layer_info["layers_list"].append({
                 "layer_number": layer_idx,
                 "z_position": z_ref,
                 "n_atoms": len(layer_atoms),
-                "atom_indices": layer_atoms
+                "atom_indices": np.sort(layer_atoms)
             })
 
         return layer_info
 
     def _get_composition(self) -> Dict[str, int]:
         """Get element composition"""
-        composition = {}
-        for symbol in self.surface.get_chemical_symbols():
-            composition[symbol] = composition.get(symbol, 0) + 1
-        return composition
+        symbols, counts = np.unique(self.surface.get_chemical_symbols(), return_counts=True)
+        return dict(zip(symbols.tolist(), counts.tolist()))
 
     def _get_dimensions(self) -> Dict[str, float]:
         """Get structure dimensions"""
-        positions = self.surface.get_positions()
-        return {
-            "x": positions[:, 0].max() - positions[:, 0].min(),
-            "y": positions[:, 1].max() - positions[:, 1].min(),
-            "z": positions[:, 2].max() - positions[:, 2].min(),
-        }
+        dx, dy, dz = np.ptp(self._positions, axis=0)
+        return {"x": dx, "y": dy, "z": dz}
 
     def _get_surface_area(self) -> float:
         """Get XY surface area"""
@@ -183,6 +185,9 @@ class SurfaceAnalyzer:
         if not self._info:
             return "No analysis performed"
 
+        if self._info_text is not None and self._info_text[0] == self._info_version:
+            return self._info_text[1]
+
         info = self._info
         text = "=" * 60 + "\n"
         text += "SURFACE INFORMATION\n"
@@ -210,6 +215,7 @@ class SurfaceAnalyzer:
         else:
             text += info.get('message', '') + "\n"
 
+        self._info_text = (self._info_version, text)
         return text
 
     def is_slab(self) -> bool:
@@ -228,14 +234,9 @@ class SurfaceAnalyzer:
 
         return self._info['layers']['n_layers'] if 'layers' in self._info else None
 
-    def get_layer_atom_indices(self, layer_num: int) -> List[int]:
+    def get_layer_atom_indices(self, layer_num: int) -> np.ndarray:
         """Get atom indices for a specific layer"""
         if not self.is_slab() or self._info is None:
-            return []
-
-        layers = self._info.get('layers', {}).get('layers_list', [])
-        for layer in layers:
-            if layer['layer_number'] == layer_num:
-                return layer['atom_indices']
+            return np.empty(0, dtype=np.int64)
 
-        return []
+        return self._layer_index_map.get(layer_num, np.empty(0, dtype=np.int64))
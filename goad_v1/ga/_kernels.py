@@ -0,0 +1,210 @@
+"""
+Numerical kernels for the genetic algorithm in GOAD v1.0
+
+Compiled with Numba when it is installed, plain NumPy otherwise
+"""
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from ..utils import _torsion_kernels
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _apply_euler_rotation_numpy(angles_deg, positions, offset, out):
+    """NumPy version of apply_euler_rotation"""
+    R = Rotation.from_euler('xyz', angles_deg, degrees=True).as_matrix()
+    np.dot(positions, R.T, out=out)
+    out += offset
+
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _apply_euler_rotation_numba(angles_deg, positions, offset, out):
+        """Numba version of apply_euler_rotation (R built and applied inline)"""
+        a = np.deg2rad(angles_deg[0])
+        b = np.deg2rad(angles_deg[1])
+        g = np.deg2rad(angles_deg[2])
+        sa, ca = np.sin(a), np.cos(a)
+        sb, cb = np.sin(b), np.cos(b)
+        sg, cg = np.sin(g), np.cos(g)
+
+        # R = Rz(gamma) @ Ry(beta) @ Rx(alpha)
+        r00 = cb * cg
+        r01 = sa * sb * cg - ca * sg
+        r02 = ca * sb * cg + sa * sg
+        r10 = cb * sg
+        r11 = sa * sb * sg + ca * cg
+        r12 = ca * sb * sg - sa * cg
+        r20 = -sb
+        r21 = sa * cb
+        r22 = ca * cb
+
+        ox, oy, oz = offset[0], offset[1], offset[2]
+        for i in range(positions.shape[0]):
+            x = positions[i, 0]
+            y = positions[i, 1]
+            z = positions[i, 2]
+            out[i, 0] = r00 * x + r01 * y + r02 * z + ox
+            out[i, 1] = r10 * x + r11 * y + r12 * z + oy
+            out[i, 2] = r20 * x + r21 * y + r22 * z + oz
+
+
+def apply_euler_rotation(angles_deg: np.ndarray, positions: np.ndarray,
+                         offset: np.ndarray, out: np.ndarray) -> None:
+    """
+    Rotate positions about the origin and translate them, writing into out.
+
+    Computes out = positions @ R.T + offset, where R is built from
+    extrinsic x, y, z Euler angles (same convention as
+    Rotation.from_euler('xyz', angles_deg, degrees=True)).
+
+    Args:
+        angles_deg: Euler angles alpha, beta, gamma (degrees)
+        positions: (N, 3) C-contiguous float64 positions, centered on the pivot
+        offset: Translation added after the rotation
+        out: (N, 3) C-contiguous float64 output buffer
+    """
+    if HAS_NUMBA:
+        _apply_euler_rotation_numba(
+            np.ascontiguousarray(angles_deg, dtype=np.float64),
+            positions,
+            np.ascontiguousarray(offset, dtype=np.float64),
+            out)
+    else:
+        _apply_euler_rotation_numpy(angles_deg, positions, offset, out)
+
+
+def _breed_numpy(genomes, energies, out, n_elite, crossover_rate, crossover_draw,
+                 tournaments, crossover_mask, mut_choice, noise_pos, noise_orient,
+                 noise_tors, tors_mask):
+    """NumPy version of breed"""
+    rows = np.arange(n_elite, genomes.shape[0])
+    if rows.size == 0:
+        return
+
+    # Tournament winners: column 0 is the first parent, column 1 the second
+    t = tournaments[rows]
+    parents = np.take_along_axis(t, np.argmin(energies[t], axis=2)[..., None], axis=2)[..., 0]
+    p1 = genomes[parents[:, 0]]
+    p2 = genomes[parents[:, 1]]
+
+    # Crossover: position from parent1, orientation from parent2, torsions mixed
+    children = p1.copy()
+    crossed = crossover_draw[rows] < crossover_rate
+    children[crossed, 3:6] = p2[crossed, 3:6]
+    mix = crossed[:, None] & (crossover_mask[rows] >= 0.5)
+    children[:, 6:][mix] = p2[:, 6:][mix]
+
+    # Mutation of the remaining children (one gene group each)
+    choice = mut_choice[rows]
+    mutated = ~crossed
+    pos = mutated & (choice < 0.33)
+    orient = mutated & (choice >= 0.33) & (choice < 0.66)
+    tors = mutated[:, None] & (choice >= 0.66)[:, None] & (tors_mask[rows] < 0.5)
+
+    children[pos, 0:3] += noise_pos[rows][pos]
+    children[orient, 3:6] = (children[orient, 3:6] + noise_orient[rows][orient]) % 360
+    torsions = children[:, 6:]
+    torsions[tors] = (torsions[tors] + noise_tors[rows][tors]) % 360
+
+    out[rows] = children
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _tournament_winner(energies, candidates):
+        """Row index of the lowest-energy candidate"""
+        best = candidates[0]
+        for c in candidates[1:]:
+            if energies[c] < energies[best]:
+                best = c
+        return best
+
+    @njit(cache=True)
+    def _breed_numba(genomes, energies, out, n_elite, crossover_rate, crossover_draw,
+                     tournaments, crossover_mask, mut_choice, noise_pos, noise_orient,
+                     noise_tors, tors_mask):
+        """Numba version of breed"""
+        n_torsions = genomes.shape[1] - 6
+        for k in range(n_elite, genomes.shape[0]):
+            p1 = _tournament_winner(energies, tournaments[k, 0])
+            out[k, :] = genomes[p1, :]
+
+            if crossover_draw[k] < crossover_rate:
+                # Position from parent1, orientation from parent2, torsions mixed
+                p2 = _tournament_winner(energies, tournaments[k, 1])
+                for j in range(3, 6):
+                    out[k, j] = genomes[p2, j]
+                for j in range(n_torsions):
+                    if crossover_mask[k, j] >= 0.5:
+                        out[k, 6 + j] = genomes[p2, 6 + j]
+
+            elif mut_choice[k] < 0.33:
+                for j in range(3):
+                    out[k, j] += noise_pos[k, j]
+
+            elif mut_choice[k] < 0.66:
+                for j in range(3):
+                    out[k, 3 + j] = (out[k, 3 + j] + noise_orient[k, j]) % 360
+
+            else:
+                for j in range(n_torsions):
+                    if tors_mask[k, j] < 0.5:
+                        out[k, 6 + j] = (out[k, 6 + j] + noise_tors[k, j]) % 360
+
+
+def breed(genomes: np.ndarray, energies: np.ndarray, out: np.ndarray, n_elite: int,
+          crossover_rate: float, crossover_draw: np.ndarray, tournaments: np.ndarray,
+          crossover_mask: np.ndarray, mut_choice: np.ndarray, noise_pos: np.ndarray,
+          noise_orient: np.ndarray, noise_tors: np.ndarray, tors_mask: np.ndarray) -> None:
+    """
+    Write the non-elite children of the next generation into out.
+
+    Each child k >= n_elite has two tournament-selected parents. With
+    probability crossover_rate it takes its position from parent1, its
+    orientation from parent2 and each torsion from either. Otherwise it is
+    a copy of parent1 with either its position, its orientation or a random
+    subset of its torsions mutated. All random numbers are drawn by the
+    caller; row k of every draw array belongs to child k.
+
+    Args:
+        genomes: (pop, 6 + n_torsions) genomes of the current generation
+        energies: (pop,) their energies
+        out: (pop, 6 + n_torsions) next generation; rows < n_elite are left as-is
+        n_elite: Number of elite rows to skip
+        crossover_rate: Probability of crossover instead of mutation
+        crossover_draw: (pop,) uniform draws deciding crossover vs. mutation
+        tournaments: (pop, 2, tournament_size) int64 candidate rows of both parents
+        crossover_mask: (pop, n_torsions) uniform draws; >= 0.5 takes parent2's torsion
+        mut_choice: (pop,) uniform draws choosing the mutated gene group
+        noise_pos: (pop, 3) position noise (Angstrom)
+        noise_orient: (pop, 3) orientation noise (degrees)
+        noise_tors: (pop, n_torsions) torsion noise (degrees)
+        tors_mask: (pop, n_torsions) uniform draws; < 0.5 mutates that torsion
+    """
+    kernel = _breed_numba if HAS_NUMBA else _breed_numpy
+    kernel(genomes, energies, out, n_elite, crossover_rate, crossover_draw,
+           tournaments, crossover_mask, mut_choice, noise_pos, noise_orient,
+           noise_tors, tors_mask)
+
+
+def warm_up():
+    """Compile (or load from the Numba cache) the kernels on tiny inputs"""
+    if not HAS_NUMBA:
+        return
+
+    positions = np.zeros((1, 3))
+    apply_euler_rotation(np.zeros(3), positions, np.zeros(3), np.empty((1, 3)))
+
+    _torsion_kernels.warm_up()
+
+    genomes = np.zeros((2, 7))
+    breed(genomes, np.zeros(2), np.empty_like(genomes), 1, 0.5, np.zeros(2),
+          np.zeros((2, 2, 1), dtype=np.int64), np.zeros((2, 1)), np.zeros(2),
+          np.zeros((2, 3)), np.zeros((2, 3)), np.zeros((2, 1)), np.zeros((2, 1)))
@@ -5,17 +5,52 @@ Surface atoms are completely fixed during GA optimization
 Includes molecular torsions in the genome
 """
 
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import numpy as np
 from ase import Atoms
-from ase.optimize import BFGS
 from ase.constraints import FixAtoms
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 import logging
 
 from ..utils.torsion_handler import TorsionHandler
+from ..utils.fitness_cache import LRUCache, genome_key
+from ..utils.calculator_manager import CalculatorManager
+from ._kernels import apply_euler_rotation, breed
 
 logger = logging.getLogger(__name__)
 
+# Genome layout: one row per individual
+_POSITION = slice(0, 3)     # X, Y, Z of the molecule COM (Angstrom)
+_ORIENTATION = slice(3, 6)  # Euler angles alpha, beta, gamma (degrees)
+_TORSIONS = slice(6, None)  # Torsion angles (degrees)
+
+# Calculator attached to systems evaluated in a worker process
+_worker_calculator = None
+
+
+def _init_worker(calculator, calculator_spec: Optional[str] = None):
+    """
+    Set up the calculator of a freshly started worker process.
+
+    With a calculator_spec the worker builds its own calculator through
+    CalculatorManager (once per process) instead of using the pickled one.
+    """
+    global _worker_calculator
+    if calculator_spec is not None:
+        _worker_calculator = CalculatorManager.get_calculator(calculator_spec)
+    else:
+        _worker_calculator = calculator
+
+
+def _evaluate_energy(system: Atoms) -> float:
+    """Potential energy of a system, evaluated in a worker process"""
+    system.calc = _worker_calculator
+    return system.get_potential_energy()
+
 
 class GeneticAlgorithm:
     """
@@ -32,7 +67,12 @@ class GeneticAlgorithm:
                  n_fixed_layers: int = 1,
                  generations: int = 50, population_size: int = 30,
                  mutation_rate: float = 0.3, crossover_rate: float = 0.7,
-                 elite_size: int = 5, verbose: bool = True):
+                 elite_size: int = 5, n_workers: Optional[int] = 1,
+                 calculator_spec: Optional[str] = None,
+                 batch_evaluate: Optional[Callable[[List[Atoms]], Sequence[float]]] = None,
+                 seed: Optional[int] = None, cache: Optional[LRUCache] = None,
+                 progress_callback: Optional[Callable[[int, np.ndarray], None]] = None,
+                 verbose: bool = True):
         """
         Initialize GA.
 
@@ -48,6 +88,20 @@ class GeneticAlgorithm:
             mutation_rate: Mutation rate (0-1)
             crossover_rate: Crossover rate (0-1)
             elite_size: Number of elite individuals to preserve
+            n_workers: Worker processes for energy evaluations
+                (1 = serial, None = one per CPU core)
+            calculator_spec: CalculatorManager type of the calculator
+                (e.g. "1m"); workers then build their own calculator
+                instead of receiving a pickled copy
+            batch_evaluate: Function returning the total energies of a list
+                of systems in one call (defaults to calculator.calculate_batch
+                when the calculator has one)
+            seed: Seed for the random number generator
+            cache: Fitness cache keyed by the rounded genome; individuals
+                with a cached adsorption energy are not recalculated
+            progress_callback: Called after every generation with the
+                generation index and the adsorption energies evaluated in
+                it (called from the thread running the GA)
             verbose: Print progress
         """
         self.surface = surface
@@ -63,23 +117,64 @@ class GeneticAlgorithm:
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
         self.elite_size = elite_size
+        self.n_workers = n_workers
+        self.calculator_spec = calculator_spec
+        if batch_evaluate is None:
+            batch_evaluate = getattr(calculator, 'calculate_batch', None)
+        self.batch_evaluate = batch_evaluate
         self.verbose = verbose
+        self._rng = np.random.default_rng(seed)
+        self.cache = cache
+        self.progress_callback = progress_callback
 
         # Surface properties
         self._analyze_surface()
 
+        # Surface with every atom fixed, shared by all evaluated systems
+        self._surface_template = self.surface.copy()
+        self._surface_template.set_constraint(FixAtoms(indices=np.arange(len(self.surface))))
+
+        # Molecule coordinates relative to its center of mass, and the
+        # output buffer for their rotated + translated copy
+        self._mol_centered = self.molecule.get_positions() - self.molecule.get_center_of_mass()
+        masses = self.molecule.get_masses()
+        self._mol_mass_weights = masses / masses.sum()
+        self._rotation_buffer = np.empty((len(self.molecule), 3))
+
         # Torsion handling
         self.torsion_handler = TorsionHandler(molecule)
         self.n_torsions = self.torsion_handler.n_torsions
+        self.n_genes = 6 + self.n_torsions
 
         if self.n_torsions > 0:
             logger.info(f"Molecule has {self.n_torsions} rotatable bonds")
         else:
             logger.info("Molecule has no rotatable bonds (rigid)")
 
-        # Population and history
-        self.population = []
-        self.fitness_history = []
+        # Random draws for breeding one generation (row k is used by
+        # individual k), refilled at the start of every generation
+        self.tournament_size = 5
+        self._cross_draw = np.empty(population_size)
+        self._tournaments = np.empty((population_size, 2, self.tournament_size), dtype=np.int64)
+        self._cross_mask = np.empty((population_size, self.n_torsions))
+        self._mut_choice = np.empty(population_size)
+        self._mut_noise_pos = np.empty((population_size, 3))
+        self._mut_noise_orient = np.empty((population_size, 3))
+        self._mut_noise_tors = np.empty((population_size, self.n_torsions))
+        self._mut_tors_mask = np.empty((population_size, self.n_torsions))
+
+        # Worker pool for energy evaluations (only alive during run())
+        self._executor = None
+
+        # Population (one genome row per individual) and history.
+        # Unevaluated individuals have energy NaN.
+        self.genomes = np.empty((0, self.n_genes))
+        self.energies = np.empty(0)
+
+        # Energies of all evaluations, in order. At most population_size
+        # evaluations per generation; only the first _hist_ptr are filled.
+        self.fitness_history = np.full(generations * population_size, np.inf)
+        self._hist_ptr = 0
         self.best_individual = None
         self.best_energy = float('inf')
 
@@ -118,26 +213,42 @@ class GeneticAlgorithm:
         logger.info(f"  Position (X, Y, Z):     3 genes")
         logger.info(f"  Orientation (α, β, γ): 3 genes")
         logger.info(f"  Torsions:               {self.n_torsions} genes")
-        logger.info(f"  Total genes per individual: {6 + self.n_torsions}")
+        logger.info(f"  Total genes per individual: {self.n_genes}")
         logger.info("=" * 60 + "\n")
 
         # Initialize population
         self._initialize_population()
 
-        # Main GA loop
-        for gen in range(self.generations):
-            # Evaluate fitness
-            self._evaluate_population()
-
-            # Log progress
-            if self.verbose:
-                best_gen = min(self.fitness_history[-self.population_size:])
-                logger.info(f"Gen {gen+1}/{self.generations} | "
-                          f"Best: {best_gen:.4f} eV | "
-                          f"Overall best: {self.best_energy:.4f} eV")
-
-            # Selection, crossover, mutation
-            self._selection_crossover_mutation()
+        self._executor = self._start_worker_pool()
+        try:
+            # Main GA loop
+            for gen in range(self.generations):
+                # Evaluate fitness
+                hist_start = self._hist_ptr
+                self._evaluate_population()
+                if self.cache is not None:
+                    self.cache.flush()
+
+                if self.progress_callback is not None:
+                    self.progress_callback(
+                        gen, self.fitness_history[hist_start:self._hist_ptr].copy())
+
+                # Log progress
+                if self.verbose:
+                    start = max(0, self._hist_ptr - self.population_size)
+                    best_gen = self.fitness_history[start:self._hist_ptr].min()
+                    logger.info(f"Gen {gen+1}/{self.generations} | "
+                              f"Best: {best_gen:.4f} eV | "
+                              f"Overall best: {self.best_energy:.4f} eV")
+
+                # Selection, crossover, mutation
+                self._selection_crossover_mutation()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            if self.cache is not None:
+                self.cache.flush()
 
         logger.info("\n" + "=" * 60)
         logger.info("GA COMPLETED")
@@ -145,236 +256,351 @@ class GeneticAlgorithm:
 
         return self._get_results()
 
+    def _start_worker_pool(self) -> Optional[ProcessPoolExecutor]:
+        """
+        Start the worker pool for parallel energy evaluations.
+
+        Returns:
+            Executor, or None when evaluations run serially
+        """
+        n_workers = self.n_workers or os.cpu_count() or 1
+        if n_workers <= 1 or self.batch_evaluate is not None:
+            return None
+
+        # Pool start-up is not worth it for tiny populations
+        if self.population_size <= 4:
+            return None
+
+        if self.calculator_spec is not None:
+            # Each worker builds its own calculator
+            initargs = (None, self.calculator_spec)
+        else:
+            # Each worker gets its own copy of the calculator
+            try:
+                pickle.dumps(self.calculator)
+            except Exception as e:
+                logger.warning(f"Calculator cannot be sent to worker processes, "
+                               f"evaluating serially: {e}")
+                return None
+            initargs = (self.calculator,)
+
+        logger.info(f"Evaluating energies with {n_workers} worker processes")
+        return ProcessPoolExecutor(max_workers=n_workers,
+                                   initializer=_init_worker,
+                                   initargs=initargs)
+
     def _initialize_population(self):
         """Initialize random population"""
         logger.info("Initializing population...")
 
-        for i in range(self.population_size):
-            # Random molecule position above surface
-            x = self.surface_center_xy[0] + np.random.uniform(-self.search_radius, self.search_radius)
-            y = self.surface_center_xy[1] + np.random.uniform(-self.search_radius, self.search_radius)
-            z = self.surface_z_max + np.random.uniform(self.surface_buffer, self.max_height)
-
-            # Random orientation (Euler angles in degrees)
-            euler_angles = np.random.uniform(0, 360, 3)
+        n = self.population_size
+        self.genomes = np.empty((n, self.n_genes))
 
-            # Random torsion angles (0-360 degrees)
-            torsion_angles = np.random.uniform(0, 360, self.n_torsions)
+        # Random molecule positions above surface
+        self.genomes[:, 0:2] = self.surface_center_xy + self._rng.uniform(
+            -self.search_radius, self.search_radius, size=(n, 2))
+        self.genomes[:, 2] = self.surface_z_max + self._rng.uniform(
+            self.surface_buffer, self.max_height, size=n)
 
-            individual = {
-                'position': np.array([x, y, z]),
-                'orientation': np.array(euler_angles),
-                'torsions': np.array(torsion_angles),
-                'energy': None,
-                'structure': None
-            }
+        # Random orientations (Euler angles) and torsion angles, 0-360 degrees
+        self.genomes[:, 3:] = self._rng.uniform(0, 360, size=(n, 3 + self.n_torsions))
 
-            self.population.append(individual)
+        self.energies = np.full(n, np.nan)
 
     def _evaluate_population(self):
         """Evaluate fitness of all individuals"""
-        for individual in self.population:
-            if individual['energy'] is None:
-                individual['energy'] = self._calculate_energy(individual)
-                self.fitness_history.append(individual['energy'])
-
-                # Update best
-                if individual['energy'] < self.best_energy:
-                    self.best_energy = individual['energy']
-                    self.best_individual = individual.copy()
+        pending = np.flatnonzero(np.isnan(self.energies))
+        if pending.size == 0:
+            return
+
+        e_ads = np.empty(pending.size)
+        systems = [None] * pending.size
+
+        # Look up cached energies first
+        to_compute = np.ones(pending.size, dtype=bool)
+        if self.cache is not None:
+            keys = [genome_key(genome) for genome in self.genomes[pending]]
+            for i, key in enumerate(keys):
+                cached = self.cache.get(key)
+                if cached is not None:
+                    e_ads[i] = cached
+                    to_compute[i] = False
+        computed = np.flatnonzero(to_compute)
+
+        if computed.size > 0:
+            genomes = self.genomes[pending[computed]]
+            if self.batch_evaluate is not None:
+                results = self._calculate_energies_batch(genomes)
+            elif self._executor is not None:
+                results = self._calculate_energies_parallel(genomes)
+            else:
+                torsioned = self._torsioned_positions(genomes)
+                results = [self._calculate_energy(genome, torsioned[k])
+                           for k, genome in enumerate(genomes)]
+            raw_energies, computed_systems = zip(*results)
+
+            # Adsorption energies; failed calculations get a penalty
+            e_computed = np.array(raw_energies) - (self.surface_energy + self.molecule_energy)
+            failed = np.isnan(e_computed)
+            e_computed[failed] = 1000.0
+            e_ads[computed] = e_computed
+
+            for i, system in zip(computed, computed_systems):
+                systems[i] = system
+
+            # Failures may be transient (e.g. out of GPU memory), so only
+            # successful calculations are cached
+            if self.cache is not None:
+                for i in computed[~failed]:
+                    self.cache.put(keys[i], e_ads[i])
+
+        self.energies[pending] = e_ads
+        self.fitness_history[self._hist_ptr:self._hist_ptr + e_ads.size] = e_ads
+        self._hist_ptr += e_ads.size
+
+        # Update best (the only individual that keeps its structure).
+        # Cached hits were not built, so rebuild the structure if needed.
+        best = np.argmin(e_ads)
+        if e_ads[best] < self.best_energy:
+            genome = self.genomes[pending[best]]
+            structure = systems[best] if to_compute[best] else self._create_system(genome)
+            self.best_energy = float(e_ads[best])
+            self.best_individual = self._make_individual(genome, self.best_energy, structure)
+
+    def _make_individual(self, genome: np.ndarray, energy: float,
+                         structure: Optional[Atoms] = None) -> Dict:
+        """Unpack a genome row into an individual dictionary"""
+        return {
+            'position': genome[_POSITION].copy(),
+            'orientation': genome[_ORIENTATION].copy(),
+            'torsions': genome[_TORSIONS].copy(),
+            'energy': energy,
+            'structure': structure,
+        }
 
-    def _calculate_energy(self, individual: Dict) -> float:
+    def _calculate_energy(self, genome: np.ndarray,
+                          positions: Optional[np.ndarray] = None) -> Tuple[float, Optional[Atoms]]:
         """
         Calculate energy of a molecule placement.
 
         Args:
-            individual: Individual with position and orientation
+            genome: Genome row with position, orientation and torsions
+            positions: Molecule positions with the genome's torsions applied
+                (see _create_system)
 
         Returns:
-            Energy value
+            Total energy of the system and the system itself
+            (NaN and None if the calculation failed)
         """
         try:
-            # Create system: surface + positioned molecule
-            system = self._create_system(individual)
-
-            # Fix all surface atoms
-            surface_atoms_count = len(self.surface)
-            fixed_indices = list(range(surface_atoms_count))
-            system.set_constraint(FixAtoms(indices=fixed_indices))
+            # Create system: fixed surface + positioned molecule
+            system = self._create_system(genome, positions)
 
             # Set calculator
-            system.set_calculator(self.calculator)
+            system.calc = self.calculator
 
             # Calculate energy
-            energy = system.get_potential_energy()
-
-            # Calculate adsorption energy
-            e_ads = energy - (self.surface_energy + self.molecule_energy)
-
-            individual['structure'] = system
-
-            return e_ads
+            return system.get_potential_energy(), system
 
         except Exception as e:
             logger.warning(f"Energy calculation failed: {e}")
-            return 1000.0  # Penalty for failed calculation
+            return np.nan, None
 
-    def _create_system(self, individual: Dict) -> Atoms:
+    def _calculate_energies_parallel(self, genomes: np.ndarray) -> List[Tuple[float, Optional[Atoms]]]:
         """
-        Create combined system of surface + positioned molecule.
+        Calculate energies of several individuals in the worker pool.
+
+        Systems are built in this process; only the calculator call runs
+        in the workers.
 
         Args:
-            individual: Individual with position, orientation, and torsions
+            genomes: Genome rows with position, orientation and torsions
 
         Returns:
-            Combined Atoms object
+            (total energy, system) pairs in the same order as genomes,
+            (NaN, None) for failed calculations
         """
-        surface_copy = self.surface.copy()
-        molecule_copy = self.molecule.copy()
+        torsioned = self._torsioned_positions(genomes)
+        submitted = []
+        try:
+            for k, genome in enumerate(genomes):
+                try:
+                    system = self._create_system(genome, torsioned[k])
+                    submitted.append((system, self._executor.submit(_evaluate_energy, system)))
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Energy calculation failed: {e}")
+                    submitted.append((None, None))
+
+            results = []
+            for system, future in submitted:
+                if future is None:
+                    results.append((np.nan, None))
+                    continue
+                try:
+                    results.append((future.result(), system))
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Energy calculation failed: {e}")
+                    results.append((np.nan, None))
+
+            return results
+
+        except BrokenProcessPool as e:
+            # e.g. a worker could not build its calculator
+            logger.warning(f"Worker pool failed, evaluating serially: {e}")
+            # Cancelled by hand: shutdown(cancel_futures=True) needs Python 3.9
+            for _, future in submitted:
+                if future is not None:
+                    future.cancel()
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            return [self._calculate_energy(genome, torsioned[k])
+                    for k, genome in enumerate(genomes)]
+
+    def _calculate_energies_batch(self, genomes: np.ndarray) -> List[Tuple[float, Optional[Atoms]]]:
+        """
+        Calculate energies of several individuals in one batch_evaluate call.
 
-        # Apply torsions FIRST (before positioning)
-        if self.n_torsions > 0:
-            molecule_copy = self.torsion_handler.apply_torsions(
-                molecule_copy,
-                individual['torsions']
-            )
+        batch_evaluate(systems) returns one total energy per system (e.g.
+        ML potentials running batched forward passes on the GPU).
 
-        # Position molecule
-        molecule_copy.translate(individual['position'] - molecule_copy.get_center_of_mass())
+        Args:
+            genomes: Genome rows with position, orientation and torsions
+
+        Returns:
+            (total energy, system) pairs in the same order as genomes,
+            (NaN, None) for failed calculations
+        """
+        torsioned = self._torsioned_positions(genomes)
+        systems = []
+        for k, genome in enumerate(genomes):
+            try:
+                systems.append(self._create_system(genome, torsioned[k]))
+            except Exception as e:
+                logger.warning(f"Energy calculation failed: {e}")
+                systems.append(None)
+
+        built = [system for system in systems if system is not None]
+        results = [(np.nan, None)] * len(systems)
+        if not built:
+            return results
+
+        try:
+            batch_energies = list(self.batch_evaluate(built))
+        except Exception as e:
+            logger.warning(f"Batch energy calculation failed: {e}")
+            return results
 
-        # Apply rotation
-        self._apply_rotation(molecule_copy, individual['orientation'])
+        # Energies can only be matched to systems if there is one per system
+        if len(batch_energies) != len(built):
+            logger.warning(f"Batch energy calculation failed: got {len(batch_energies)} "
+                           f"energies for {len(built)} systems")
+            return results
 
-        # Combine
-        system = surface_copy + molecule_copy
+        batch_energies = iter(batch_energies)
+        for i, system in enumerate(systems):
+            if system is not None:
+                results[i] = (float(next(batch_energies)), system)
 
-        return system
+        return results
 
-    def _apply_rotation(self, atoms: Atoms, euler_angles: np.ndarray):
+    def _torsioned_positions(self, genomes: np.ndarray) -> np.ndarray:
         """
-        Apply rotation to atoms using Euler angles.
+        Molecule positions with the torsions of several genomes applied.
+
+        All genomes are handled in one TorsionHandler.apply_torsions_batch
+        call.
 
         Args:
-            atoms: Atoms to rotate
-            euler_angles: Euler angles in degrees [alpha, beta, gamma]
+            genomes: Genome rows with position, orientation and torsions
+
+        Returns:
+            (len(genomes), n_atoms, 3) positions, one molecule per genome
         """
-        from ase.geometry.geometry import get_distances
-
-        # Convert to radians
-        angles_rad = np.deg2rad(euler_angles)
-
-        # Rotation matrices
-        alpha, beta, gamma = angles_rad
-
-        # Rx (rotation around x)
-        Rx = np.array([
-            [1, 0, 0],
-            [0, np.cos(alpha), -np.sin(alpha)],
-            [0, np.sin(alpha), np.cos(alpha)]
-        ])
-
-        # Ry (rotation around y)
-        Ry = np.array([
-            [np.cos(beta), 0, np.sin(beta)],
-            [0, 1, 0],
-            [-np.sin(beta), 0, np.cos(beta)]
-        ])
-
-        # Rz (rotation around z)
-        Rz = np.array([
-            [np.cos(gamma), -np.sin(gamma), 0],
-            [np.sin(gamma), np.cos(gamma), 0],
-            [0, 0, 1]
-        ])
-
-        # Combined rotation matrix
-        R = Rz @ Ry @ Rx
-
-        # Center of mass
-        com = atoms.get_center_of_mass()
-
-        # Rotate around COM
-        positions = atoms.get_positions()
-        relative_pos = positions - com
-        rotated_pos = relative_pos @ R.T
-        atoms.set_positions(rotated_pos + com)
+        return self.torsion_handler.apply_torsions_batch(
+            self.molecule.get_positions(), genomes[:, _TORSIONS])
 
-    def _selection_crossover_mutation(self):
-        """Selection, crossover, and mutation"""
+    def _create_system(self, genome: np.ndarray,
+                       positions: Optional[np.ndarray] = None) -> Atoms:
+        """
+        Create combined system of surface + positioned molecule.
 
-        # Sort population by fitness
-        self.population.sort(key=lambda x: x['energy'])
+        The surface part carries the FixAtoms constraint of the template.
 
-        # Keep elite
-        new_population = self.population[:self.elite_size].copy()
+        Args:
+            genome: Genome row with position, orientation, and torsions
+            positions: Molecule positions with the genome's torsions applied
+                (one row of _torsioned_positions; computed if None)
 
-        # Generate new individuals
-        while len(new_population) < self.population_size:
-            if np.random.random() < self.crossover_rate:
-                # Crossover
-                parent1 = self._select_parent()
-                parent2 = self._select_parent()
-                child = self._crossover(parent1, parent2)
-            else:
-                # Mutate elite
-                parent = self._select_parent()
-                child = self._mutate(parent.copy())
-
-            new_population.append(child)
-
-        self.population = new_population
-
-    def _select_parent(self) -> Dict:
-        """Select parent using tournament selection"""
-        tournament_size = 5
-        tournament = np.random.choice(len(self.population), tournament_size, replace=False)
-        winner_idx = min(tournament, key=lambda i: self.population[i]['energy'])
-        return self.population[winner_idx].copy()
-
-    def _crossover(self, parent1: Dict, parent2: Dict) -> Dict:
-        """Crossover two parents"""
-        # 50% from parent1, 50% from parent2
-        child = {
-            'position': parent1['position'].copy(),
-            'orientation': parent2['orientation'].copy(),
-            'torsions': np.zeros(self.n_torsions),
-            'energy': None,
-            'structure': None
-        }
+        Returns:
+            Combined Atoms object
+        """
+        molecule_copy = self.molecule.copy()
 
-        # Mix torsions
-        for i in range(self.n_torsions):
-            if np.random.random() < 0.5:
-                child['torsions'][i] = parent1['torsions'][i]
-            else:
-                child['torsions'][i] = parent2['torsions'][i]
+        # Torsions are applied FIRST (before positioning)
+        if self.n_torsions > 0:
+            if positions is None:
+                positions = self._torsioned_positions(genome[None])[0]
+            centered = positions - self._mol_mass_weights @ positions
+        else:
+            centered = self._mol_centered
 
-        return child
+        # Rotate around the COM and move the COM to the genome position in one step.
+        # Extrinsic rotations about x, y then z: R = Rz @ Ry @ Rx
+        apply_euler_rotation(genome[_ORIENTATION], centered, genome[_POSITION],
+                             self._rotation_buffer)
+        molecule_copy.set_positions(self._rotation_buffer)
 
-    def _mutate(self, individual: Dict) -> Dict:
-        """Mutate an individual"""
-        mutation_choice = np.random.random()
+        # Combine (constraints of the surface template are preserved)
+        system = self._surface_template + molecule_copy
 
-        if mutation_choice < 0.33:
-            # Mutate position
-            individual['position'] += np.random.normal(0, 0.5, 3)
+        return system
 
-        elif mutation_choice < 0.66:
-            # Mutate orientation
-            individual['orientation'] += np.random.normal(0, 10, 3)
-            individual['orientation'] = individual['orientation'] % 360
+    def _selection_crossover_mutation(self):
+        """Selection, crossover, and mutation"""
 
-        else:
-            # Mutate torsions
-            for i in range(self.n_torsions):
-                if np.random.random() < 0.5:
-                    individual['torsions'][i] += np.random.normal(0, 20)
-                    individual['torsions'][i] = individual['torsions'][i] % 360
+        # Sort population by fitness
+        order = np.argsort(self.energies)
+        self.genomes = self.genomes[order]
+        self.energies = self.energies[order]
+
+        # Next generation is written row by row into fresh arrays
+        n_elite = min(self.elite_size, self.population_size)
+        new_genomes = np.empty_like(self.genomes)
+        new_energies = np.full(self.population_size, np.nan)
 
-        individual['energy'] = None
-        individual['structure'] = None
+        # Keep elite
+        new_genomes[:n_elite] = self.genomes[:n_elite]
+        new_energies[:n_elite] = self.energies[:n_elite]
 
-        return individual
+        # Generate new individuals
+        self._draw_breeding_randoms()
+        breed(self.genomes, self.energies, new_genomes, n_elite, self.crossover_rate,
+              self._cross_draw, self._tournaments, self._cross_mask, self._mut_choice,
+              self._mut_noise_pos, self._mut_noise_orient, self._mut_noise_tors,
+              self._mut_tors_mask)
+
+        self.genomes = new_genomes
+        self.energies = new_energies
+
+    def _draw_breeding_randoms(self):
+        """Fill the selection, crossover and mutation buffers for the next generation"""
+        self._rng.random(out=self._cross_draw)
+        # Generator.integers has no out=, so its draw is copied into the buffer
+        self._tournaments[...] = self._rng.integers(
+            0, len(self.energies), self._tournaments.shape)
+        self._rng.random(out=self._cross_mask)
+        self._rng.random(out=self._mut_choice)
+        self._rng.standard_normal(out=self._mut_noise_pos)
+        self._mut_noise_pos *= 0.5
+        self._rng.standard_normal(out=self._mut_noise_orient)
+        self._mut_noise_orient *= 10
+        self._rng.standard_normal(out=self._mut_noise_tors)
+        self._mut_noise_tors *= 20
+        self._rng.random(out=self._mut_tors_mask)
 
     def _get_results(self) -> Dict:
         """Get GA results"""
@@ -382,9 +608,10 @@ class GeneticAlgorithm:
             'best_individual': self.best_individual,
             'best_energy': self.best_energy,
             'best_structure': self.best_individual['structure'] if self.best_individual else None,
-            'fitness_history': self.fitness_history,
+            'fitness_history': self.fitness_history[:self._hist_ptr],
             'generations': self.generations,
             'population_size': self.population_size,
+            'cache_hits': self.cache.hits if self.cache is not None else 0,
         }
 
         logger.info(f"Best E_ads found: {self.best_energy:.4f} eV")
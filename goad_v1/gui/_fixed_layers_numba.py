@@ -0,0 +1,77 @@
+"""
+Fixed-layer index gathering for GOAD v1.0
+
+Compiled with Numba when it is installed, plain NumPy otherwise
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _gather_numpy(offsets, indices, start, end):
+    """NumPy version of gather"""
+    return indices[offsets[start]:offsets[end]].copy()
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _gather_numba(offsets, indices, start, end):
+        """Numba version of gather"""
+        first = offsets[start]
+        out = np.empty(offsets[end] - first, np.int64)
+        for k in range(out.shape[0]):
+            out[k] = indices[first + k]
+        return out
+
+
+def gather(offsets: np.ndarray, indices: np.ndarray, start: int, end: int) -> np.ndarray:
+    """
+    Atom indices of layers start..end-1.
+
+    Args:
+        offsets: (n_layers + 1,) int64 offsets of each layer into indices
+        indices: Flat int64 atom indices of all layers, layer after layer
+        start: First layer
+        end: One past the last layer
+
+    Returns:
+        int64 array with the atom indices of the selected layers
+    """
+    if HAS_NUMBA:
+        return _gather_numba(offsets, indices, start, end)
+    return _gather_numpy(offsets, indices, start, end)
+
+
+def layer_index_arrays(surface_analyzer):
+    """
+    Flat (offsets, indices) arrays of the analyzed layers, top to bottom.
+
+    Built once per analysis and cached on the surface analyzer.
+
+    Args:
+        surface_analyzer: Analyzed SurfaceAnalyzer (uses its layers_list)
+
+    Returns:
+        Tuple of (offsets, indices) as accepted by gather
+    """
+    layers_list = surface_analyzer.layers_list
+    cached = getattr(surface_analyzer, '_layer_index_arrays', None)
+    if cached is not None and cached[0] is layers_list:
+        return cached[1], cached[2]
+
+    counts = [len(layer['atom_indices']) for layer in layers_list]
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    if layers_list:
+        indices = np.concatenate([np.asarray(layer['atom_indices'], dtype=np.int64)
+                                  for layer in layers_list])
+    else:
+        indices = np.empty(0, dtype=np.int64)
+
+    surface_analyzer._layer_index_arrays = (layers_list, offsets, indices)
+    return offsets, indices
@@ -8,12 +8,13 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from ase.io import read
 from ase import Atoms
+import threading
 import logging
 from pathlib import Path
 
 from ..analysis.surface_analyzer import SurfaceAnalyzer
 from ..analysis.molecule_analyzer import MoleculeAnalyzer
-from .structure_viewer import StructureViewer
+from .structure_viewer import create_structure_viewer
 
 logger = logging.getLogger(__name__)
 
@@ -21,19 +22,21 @@ logger = logging.getLogger(__name__)
 class AnalysisWindow:
     """Main window for structure analysis"""
 
-    def __init__(self, root, on_complete_callback=None):
+    def __init__(self, root, on_complete_callback=None, viewer_backend="mpl"):
         """
         Initialize analysis window.
 
         Args:
             root: Tkinter root window
             on_complete_callback: Function to call when analysis is complete
+            viewer_backend: Structure viewer backend, as for create_structure_viewer
         """
         self.root = root
         self.root.title("GOAD v1.0 - Structure Analysis")
         self.root.geometry("900x700")
 
         self.on_complete_callback = on_complete_callback
+        self.viewer_backend = viewer_backend
 
         # Data storage
         self.surface = None
@@ -44,6 +47,16 @@ class AnalysisWindow:
         self.n_layers = None
         self.selected_fixed_layers = None
 
+        # Number of structure files currently being read
+        self._loads_in_flight = 0
+
+        # Report text per (structure, analysis version) and the text
+        # currently shown in each panel
+        self._surface_text_cache = None
+        self._molecule_text_cache = None
+        self._last_surface_text = None
+        self._last_molecule_text = None
+
         # Configure logging
         logging.basicConfig(level=logging.INFO)
 
@@ -66,43 +79,48 @@ class AnalysisWindow:
         title.pack(pady=(0, 20))
 
         # Left panel: File loading and analysis
+        # (children are laid out with grid, one row each)
         left_panel = ttk.LabelFrame(main_frame, text="Input Files & Analysis", padding="10")
         left_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=False, padx=(0, 10))
+        left_panel.columnconfigure(0, weight=1)
 
         # Surface section
         surface_frame = ttk.LabelFrame(left_panel, text="Surface", padding="10")
-        surface_frame.pack(fill=tk.X, pady=(0, 10))
+        surface_frame.grid(row=0, column=0, sticky='ew', pady=(0, 10))
+        surface_frame.columnconfigure(0, weight=1)
 
         self.surface_label = ttk.Label(surface_frame, text="No file loaded", foreground="red")
-        self.surface_label.pack(anchor=tk.W, pady=(0, 5))
+        self.surface_label.grid(row=0, column=0, sticky='w', pady=(0, 5))
 
         ttk.Button(
             surface_frame,
             text="Load Surface CIF",
             command=self._load_surface
-        ).pack(fill=tk.X, pady=(0, 5))
+        ).grid(row=1, column=0, sticky='ew', pady=(0, 5))
 
         # Molecule section
         molecule_frame = ttk.LabelFrame(left_panel, text="Molecule", padding="10")
-        molecule_frame.pack(fill=tk.X, pady=(0, 10))
+        molecule_frame.grid(row=1, column=0, sticky='ew', pady=(0, 10))
+        molecule_frame.columnconfigure(0, weight=1)
 
         self.molecule_label = ttk.Label(molecule_frame, text="No file loaded", foreground="red")
-        self.molecule_label.pack(anchor=tk.W, pady=(0, 5))
+        self.molecule_label.grid(row=0, column=0, sticky='w', pady=(0, 5))
 
         ttk.Button(
             molecule_frame,
             text="Load Molecule CIF",
             command=self._load_molecule
-        ).pack(fill=tk.X, pady=(0, 5))
+        ).grid(row=1, column=0, sticky='ew', pady=(0, 5))
 
         # Analysis button
-        ttk.Button(
+        self.analyze_button = ttk.Button(
             left_panel,
             text="Analyze Structures",
             command=self._analyze
-        ).pack(fill=tk.X, pady=(0, 20))
+        )
+        self.analyze_button.grid(row=2, column=0, sticky='ew', pady=(0, 20))
 
-        # Layer selection (appears after analysis)
+        # Layer selection (appears after analysis, in row 3)
         self.layer_frame = ttk.LabelFrame(left_panel, text="Fixed Layers", padding="10")
         self.layer_label = ttk.Label(
             self.layer_frame,
@@ -120,7 +138,7 @@ class AnalysisWindow:
             command=self._go_to_reference_energies,
             state=tk.DISABLED
         )
-        self.next_button.pack(fill=tk.X, pady=(10, 0))
+        self.next_button.grid(row=4, column=0, sticky='ew', pady=(10, 0))
 
         # Right panel: Analysis results and visualization
         right_panel = ttk.LabelFrame(main_frame, text="Analysis & Visualization", padding="10")
@@ -134,7 +152,8 @@ class AnalysisWindow:
         viz_frame = ttk.Frame(self.notebook)
         self.notebook.add(viz_frame, text="🔬 Structures")
 
-        self.surface_viewer = StructureViewer(viz_frame, width=7, height=4)
+        self.surface_viewer = create_structure_viewer(viz_frame, backend=self.viewer_backend,
+                                                      width=7, height=4)
 
         # Info frame below visualization
         info_viz_frame = ttk.Frame(viz_frame)
@@ -156,10 +175,10 @@ class AnalysisWindow:
             height=25,
             width=60,
             wrap=tk.WORD,
-            font=('Courier', 9),
-            state='disabled'
+            font=('Courier', 9)
         )
         self.surface_text.pack(fill=tk.BOTH, expand=True)
+        self.surface_text.bind("<Key>", lambda e: "break")  # Read-only for the user
 
         # Molecule info tab
         molecule_info_frame = ttk.Frame(self.notebook)
@@ -170,10 +189,10 @@ class AnalysisWindow:
             height=25,
             width=60,
             wrap=tk.WORD,
-            font=('Courier', 9),
-            state='disabled'
+            font=('Courier', 9)
         )
         self.molecule_text.pack(fill=tk.BOTH, expand=True)
+        self.molecule_text.bind("<Key>", lambda e: "break")  # Read-only for the user
 
     def _load_surface(self):
         """Load surface CIF file"""
@@ -183,14 +202,7 @@ class AnalysisWindow:
         )
 
         if file_path:
-            try:
-                self.surface = read(file_path)
-                filename = Path(file_path).name
-                self.surface_label.config(text=f"✓ {filename}", foreground="green")
-                logger.info(f"Loaded surface: {filename}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not load surface file:\n{e}")
-                logger.error(f"Error loading surface: {e}")
+            self._kickoff_load("surface", file_path)
 
     def _load_molecule(self):
         """Load molecule CIF file"""
@@ -200,14 +212,53 @@ class AnalysisWindow:
         )
 
         if file_path:
-            try:
-                self.molecule = read(file_path)
-                filename = Path(file_path).name
-                self.molecule_label.config(text=f"✓ {filename}", foreground="green")
-                logger.info(f"Loaded molecule: {filename}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not load molecule file:\n{e}")
-                logger.error(f"Error loading molecule: {e}")
+            self._kickoff_load("molecule", file_path)
+
+    def _kickoff_load(self, kind: str, file_path: str):
+        """Read a structure file in a worker thread"""
+        self._loads_in_flight += 1
+        self.analyze_button.config(state=tk.DISABLED)
+        label = self.surface_label if kind == "surface" else self.molecule_label
+        label.config(text=f"Loading {Path(file_path).name}...", foreground="gray")
+
+        threading.Thread(target=self._do_read, args=(kind, file_path), daemon=True).start()
+
+    def _do_read(self, kind: str, file_path: str):
+        """Parse the file (worker thread) and hand the result to the Tk thread"""
+        try:
+            atoms = read(file_path)
+        except Exception as e:
+            self.root.after(0, lambda error=e: self._on_load_failed(kind, error))
+        else:
+            self.root.after(0, lambda: self._on_loaded(kind, file_path, atoms))
+
+    def _on_loaded(self, kind: str, file_path: str, atoms: Atoms):
+        """Store a loaded structure (Tk thread)"""
+        filename = Path(file_path).name
+        if kind == "surface":
+            self.surface = atoms
+            self.surface_label.config(text=f"✓ {filename}", foreground="green")
+        else:
+            self.molecule = atoms
+            self.molecule_label.config(text=f"✓ {filename}", foreground="green")
+        logger.info(f"Loaded {kind}: {filename}")
+        self._finish_load()
+
+    def _on_load_failed(self, kind: str, error: Exception):
+        """Report a failed load (Tk thread)"""
+        label = self.surface_label if kind == "surface" else self.molecule_label
+        loaded = self.surface if kind == "surface" else self.molecule
+        if loaded is None:
+            label.config(text="No file loaded", foreground="red")
+        self._finish_load()
+        messagebox.showerror("Error", f"Could not load {kind} file:\n{error}")
+        logger.error(f"Error loading {kind}: {error}")
+
+    def _finish_load(self):
+        """Re-enable analysis once no load is in flight"""
+        self._loads_in_flight -= 1
+        if self._loads_in_flight == 0:
+            self.analyze_button.config(state=tk.NORMAL)
 
     def _analyze(self):
         """Analyze loaded structures"""
@@ -224,12 +275,17 @@ class AnalysisWindow:
             logger.info(f"Surface analysis complete: type={self.surface_type}")
 
             # Update surface text
-            surface_text = self.surface_analyzer.get_info_text()
-            self.surface_text.config(state='normal')
-            self.surface_text.delete(1.0, tk.END)
-            self.surface_text.insert(1.0, surface_text)
-            self.surface_text.config(state='disabled')
-            logger.info("Surface text updated")
+            version = self.surface_analyzer._info_version
+            cached = self._surface_text_cache
+            if cached is not None and cached[0] is self.surface and cached[1] == version:
+                surface_text = cached[2]
+            else:
+                surface_text = self.surface_analyzer.get_info_text()
+                self._surface_text_cache = (self.surface, version, surface_text)
+            if surface_text != self._last_surface_text:
+                self._show_text(self.surface_text, surface_text)
+                self._last_surface_text = surface_text
+                logger.info("Surface text updated")
 
             # Analyze molecule
             logger.info("Starting molecule analysis...")
@@ -238,12 +294,17 @@ class AnalysisWindow:
             logger.info(f"Molecule analysis complete")
 
             # Update molecule text
-            molecule_text = self.molecule_analyzer.get_info_text()
-            self.molecule_text.config(state='normal')
-            self.molecule_text.delete(1.0, tk.END)
-            self.molecule_text.insert(1.0, molecule_text)
-            self.molecule_text.config(state='disabled')
-            logger.info("Molecule text updated")
+            version = self.molecule_analyzer._info_version
+            cached = self._molecule_text_cache
+            if cached is not None and cached[0] is self.molecule and cached[1] == version:
+                molecule_text = cached[2]
+            else:
+                molecule_text = self.molecule_analyzer.get_info_text()
+                self._molecule_text_cache = (self.molecule, version, molecule_text)
+            if molecule_text != self._last_molecule_text:
+                self._show_text(self.molecule_text, molecule_text)
+                self._last_molecule_text = molecule_text
+                logger.info("Molecule text updated")
 
             # Display structures (with robust error handling)
             logger.info("Attempting to display structures...")
@@ -282,6 +343,11 @@ class AnalysisWindow:
             import traceback
             traceback.print_exc()
 
+    def _show_text(self, widget, text: str):
+        """Replace the contents of a read-only text panel"""
+        widget.delete(1.0, tk.END)
+        widget.insert(1.0, text)
+
     def _setup_layer_selection(self, surface_info: dict):
         """Setup layer selection UI"""
         layers = surface_info.get('layers', {})
@@ -310,7 +376,7 @@ class AnalysisWindow:
         self.layer_spinbox.set(1)
         self.layer_spinbox.pack(pady=(5, 0))
 
-        self.layer_frame.pack(fill=tk.X, pady=(0, 20))
+        self.layer_frame.grid(row=3, column=0, sticky='ew', pady=(0, 20))
 
     def _go_to_reference_energies(self):
         """Proceed to reference energy calculation"""
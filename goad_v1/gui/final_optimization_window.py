@@ -9,11 +9,15 @@ from tkinter import ttk, messagebox, scrolledtext
 from ase.optimize import BFGS
 from ase.constraints import FixAtoms
 from ase.io import write
+import numpy as np
 import os
 from datetime import datetime
 import threading
+import queue
 import logging
 
+from ._fixed_layers_numba import gather, layer_index_arrays
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +49,11 @@ class FinalOptimizationWindow:
         self.calculator = calculator
         self.output_dir = output_dir
 
+        # Atom counts (the structure is surface atoms followed by the molecule)
+        self._n_surface = len(surface_analyzer.surface)
+        self._n_total_initial = len(best_structure)
+        self._n_molecule = self._n_total_initial - self._n_surface
+
         # Optimization state
         self.optimize_final = True
         self.running = False
@@ -52,6 +61,18 @@ class FinalOptimizationWindow:
         self.optimized_structure = None
         self.final_energy = None
 
+        # Optimization-ready copy of best_structure, reused across runs
+        self._opt_atoms = None
+        self._opt_atoms_src = None
+        self._bfgs = None  # Optimizer of _opt_atoms_src, keeps its Hessian estimate
+
+        # Fixed atom indices keyed by (surface analyzer id, n_fixed_layers)
+        self._fixed_idx_cache = {}
+
+        # Log messages waiting to be shown (filled from any thread,
+        # drained by the Tk event loop)
+        self._log_queue = queue.Queue()
+
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
 
@@ -73,20 +94,25 @@ class FinalOptimizationWindow:
         title.pack(pady=(0, 20))
 
         # Left panel: Options and controls
-        left_panel = ttk.LabelFrame(main_frame, text="Final Step", padding="10")
-        left_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=False, padx=(0, 10), width=300)
+        # (children are laid out with grid, one row each)
+        left_panel = ttk.LabelFrame(main_frame, text="Final Step", padding="10", width=300)
+        left_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=False, padx=(0, 10))
+        left_panel.columnconfigure(0, weight=1)
 
         # Summary
         summary_frame = ttk.Frame(left_panel)
-        summary_frame.pack(fill=tk.X, pady=(0, 20))
+        summary_frame.grid(row=0, column=0, sticky='ew', pady=(0, 20))
 
-        ttk.Label(summary_frame, text="GA Results:", font=("Arial", 10, "bold")).pack(anchor=tk.W)
-        ttk.Label(summary_frame, text=f"E_adsorption: {self.best_energy:.4f} eV").pack(anchor=tk.W)
-        ttk.Label(summary_frame, text=f"Fixed layers: {self.n_fixed_layers}").pack(anchor=tk.W)
+        ttk.Label(summary_frame, text="GA Results:", font=("Arial", 10, "bold")).grid(
+            row=0, column=0, sticky='w')
+        ttk.Label(summary_frame, text=f"E_adsorption: {self.best_energy:.4f} eV").grid(
+            row=1, column=0, sticky='w')
+        ttk.Label(summary_frame, text=f"Fixed layers: {self.n_fixed_layers}").grid(
+            row=2, column=0, sticky='w')
 
         # Options
-        ttk.Label(left_panel, text="What to do:", font=("Arial", 10, "bold")).pack(
-            anchor=tk.W, pady=(10, 5))
+        ttk.Label(left_panel, text="What to do:", font=("Arial", 10, "bold")).grid(
+            row=1, column=0, sticky='w', pady=(10, 5))
 
         self.optimize_var = tk.BooleanVar(value=True)
 
@@ -95,14 +121,14 @@ class FinalOptimizationWindow:
             text="Optimize final structure",
             variable=self.optimize_var,
             value=True
-        ).pack(anchor=tk.W, pady=2)
+        ).grid(row=2, column=0, sticky='w', pady=2)
 
         ttk.Radiobutton(
             left_panel,
             text="Use as final result",
             variable=self.optimize_var,
             value=False
-        ).pack(anchor=tk.W, pady=2)
+        ).grid(row=3, column=0, sticky='w', pady=2)
 
         ttk.Label(
             left_panel,
@@ -112,14 +138,15 @@ class FinalOptimizationWindow:
             font=("Arial", 9),
             foreground="gray",
             justify=tk.LEFT
-        ).pack(anchor=tk.W, pady=(10, 0))
+        ).grid(row=4, column=0, sticky='w', pady=(10, 0))
 
         # Execute button
-        ttk.Button(
+        self.execute_button = ttk.Button(
             left_panel,
             text="Execute",
             command=self._execute
-        ).pack(fill=tk.X, pady=(30, 10))
+        )
+        self.execute_button.grid(row=5, column=0, sticky='ew', pady=(30, 10))
 
         # Save and exit button
         self.save_button = ttk.Button(
@@ -128,7 +155,7 @@ class FinalOptimizationWindow:
             command=self._save_and_exit,
             state=tk.DISABLED
         )
-        self.save_button.pack(fill=tk.X, pady=(10, 0))
+        self.save_button.grid(row=6, column=0, sticky='ew', pady=(10, 0))
 
         # Right panel: Results
         right_panel = ttk.LabelFrame(main_frame, text="Optimization Log", padding="10")
@@ -147,10 +174,10 @@ class FinalOptimizationWindow:
             height=25,
             width=80,
             wrap=tk.WORD,
-            font=('Courier', 9),
-            state='disabled'
+            font=('Courier', 9)
         )
         self.log_text.pack(fill=tk.BOTH, expand=True)
+        self.log_text.bind("<Key>", lambda e: "break")  # Read-only for the user
 
         # Results tab
         results_frame = ttk.Frame(self.notebook)
@@ -162,21 +189,38 @@ class FinalOptimizationWindow:
             width=80,
             wrap=tk.WORD,
             font=('Courier', 10),
-            state='disabled'
+            undo=False
         )
         self.results_text.pack(fill=tk.BOTH, expand=True)
+        self.results_text.bind("<Key>", lambda e: "break")  # Read-only for the user
+
+        # Start the log poller
+        self.root.after(100, self._drain_log_queue)
 
     def _log(self, message: str):
-        """Add message to log"""
-        self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, message + '\n')
-        self.log_text.see(tk.END)
-        self.log_text.config(state='disabled')
-        self.root.update()
+        """Add message to log (safe to call from the optimization thread)"""
+        self._log_queue.put(message + '\n')
         logger.info(message)
 
+    def _drain_log_queue(self):
+        """Show all queued log messages with a single insert"""
+        messages = []
+        try:
+            while True:
+                messages.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if messages:
+            self.log_text.insert(tk.END, ''.join(messages))
+            self.log_text.see(tk.END)
+
+        self.root.after(100, self._drain_log_queue)
+
     def _execute(self):
         """Execute final optimization"""
+        if self.running:
+            return
         self.optimize_final = self.optimize_var.get()
 
         self._log("=" * 80)
@@ -192,6 +236,7 @@ class FinalOptimizationWindow:
             self._log("Max steps: 500\n")
 
             self.running = True
+            self.execute_button.config(state=tk.DISABLED)
             self.opt_thread = threading.Thread(target=self._optimize_thread)
             self.opt_thread.daemon = True
             self.opt_thread.start()
@@ -205,28 +250,37 @@ class FinalOptimizationWindow:
     def _optimize_thread(self):
         """Run optimization in thread"""
         try:
-            structure = self.best_structure.copy()
-            structure.set_calculator(self.calculator)
+            if self._opt_atoms is None or self._opt_atoms_src is not self.best_structure:
+                self._opt_atoms = self.best_structure.copy()
+                self._opt_atoms.calc = self.calculator
+                self._opt_atoms_src = self.best_structure
+                self._bfgs = None  # Its Hessian belongs to the previous structure
+            else:
+                # Reset the cached copy to the GA structure
+                self._opt_atoms.set_constraint()
+                self._opt_atoms.set_positions(self.best_structure.get_positions())
+            structure = self._opt_atoms
 
             # Get fixed layer indices
             fixed_indices = self._get_fixed_layer_indices()
 
-            if fixed_indices:
+            if len(fixed_indices) > 0:
                 self._log(f"Fixing {len(fixed_indices)} atoms from bottom layers...")
                 structure.set_constraint(FixAtoms(indices=fixed_indices))
 
             # Optimize
             self._log("Starting BFGS optimizer...")
-            opt = BFGS(structure, logfile=None)
-            opt.run(fmax=0.02, steps=500)
+            if self._bfgs is None:
+                self._bfgs = BFGS(structure, logfile=None, trajectory=None, maxstep=0.2)
+            self._bfgs.run(fmax=0.02, steps=500)
 
             self.final_energy = structure.get_potential_energy()
-            self.optimized_structure = structure
+            # Publish a snapshot; the next Execute resets the cached copy
+            self.optimized_structure = structure.copy()
 
             self._log("\n✓ Optimization completed successfully")
 
             # Calculate improvement
-            surface_count = len(self.best_structure) - len(self.surface_analyzer.surface)
             initial_energy = self.best_energy
             improvement = initial_energy - self.final_energy
             improvement_pct = (improvement / abs(initial_energy)) * 100 if initial_energy != 0 else 0
@@ -236,69 +290,77 @@ class FinalOptimizationWindow:
             self._log(f"  After:  {self.final_energy:.4f} eV")
             self._log(f"  Δ:      {improvement:.4f} eV ({improvement_pct:.1f}%)")
 
-            self._display_results()
-            self.save_button.config(state=tk.NORMAL)
+            # Tk is only touched from its own thread
+            self.root.after(0, self._on_optimization_done)
 
         except Exception as e:
             self._log(f"\nERROR during optimization: {e}")
-            messagebox.showerror("Optimization Error", f"Error:\n{e}")
             logger.error(f"Optimization error: {e}")
+            self.root.after(0, messagebox.showerror, "Optimization Error", f"Error:\n{e}")
 
         finally:
             self.running = False
+            self.root.after(0, lambda: self.execute_button.config(state=tk.NORMAL))
 
-    def _get_fixed_layer_indices(self) -> list:
-        """Get indices of atoms to fix"""
-        # Get surface atom count
-        surface_count = len(self.best_structure) - len(self.surface_analyzer.surface)
+    def _on_optimization_done(self):
+        """Show the optimized structure and enable saving (Tk thread)"""
+        self._display_results()
+        self.save_button.config(state=tk.NORMAL)
 
-        # From surface_analyzer, get layer info
-        layers_info = self.surface_analyzer._info.get('layers', {}).get('layers_list', [])
-        n_total_layers = self.surface_analyzer._info.get('layers', {}).get('n_layers', 0)
+    def _get_fixed_layer_indices(self) -> np.ndarray:
+        """Get indices of atoms to fix (bottom N surface layers)"""
+        key = (id(self.surface_analyzer), self.n_fixed_layers)
+        if key in self._fixed_idx_cache:
+            return self._fixed_idx_cache[key]
 
-        fixed_indices = []
+        # Flat layer indices, built once per analysis
+        offsets, flat_indices = layer_index_arrays(self.surface_analyzer)
+        n_total_layers = self.surface_analyzer.n_layers
 
-        # Get bottom N layers
-        for i in range(n_total_layers - self.n_fixed_layers, n_total_layers):
-            if i < len(layers_info):
-                # These indices are relative to surface only, add surface_count offset
-                layer_indices = layers_info[i]['atom_indices']
-                fixed_indices.extend(layer_indices)
+        # Layers are ordered top to bottom, so the fixed ones are the last N.
+        # Indices are relative to the surface, which comes first in the structure.
+        start = max(n_total_layers - self.n_fixed_layers, 0)
+        fixed_indices = gather(offsets, flat_indices, start, n_total_layers)
 
+        self._fixed_idx_cache[key] = fixed_indices
         return fixed_indices
 
     def _display_results(self):
         """Display final results"""
-        text = "=" * 80 + "\n"
-        text += "FINAL RESULTS\n"
-        text += "=" * 80 + "\n\n"
+        parts = []
+        parts.append("=" * 80 + "\n")
+        parts.append("FINAL RESULTS\n")
+        parts.append("=" * 80 + "\n\n")
 
-        text += "OPTIMIZATION SUMMARY:\n"
-        text += "-" * 80 + "\n"
-        text += f"Mode: {'Full relaxation' if self.optimize_final else 'GA result'}\n"
-        text += f"Fixed layers: {self.n_fixed_layers}\n\n"
+        parts.append("OPTIMIZATION SUMMARY:\n")
+        parts.append("-" * 80 + "\n")
+        parts.append(f"Mode: {'Full relaxation' if self.optimize_final else 'GA result'}\n")
+        parts.append(f"Fixed layers: {self.n_fixed_layers}\n\n")
 
         if self.optimized_structure and self.final_energy is not None:
             improvement = self.best_energy - self.final_energy
             improvement_pct = (improvement / abs(self.best_energy)) * 100 if self.best_energy != 0 else 0
 
-            text += "ENERGIES (eV):\n"
-            text += f"  GA best:      {self.best_energy:>12.4f}\n"
-            text += f"  After relax:  {self.final_energy:>12.4f}\n"
-            text += f"  Improvement:  {improvement:>12.4f} ({improvement_pct:>6.1f}%)\n\n"
+            parts.append("ENERGIES (eV):\n")
+            parts.append(f"  GA best:      {self.best_energy:>12.4f}\n")
+            parts.append(f"  After relax:  {self.final_energy:>12.4f}\n")
+            parts.append(f"  Improvement:  {improvement:>12.4f} ({improvement_pct:>6.1f}%)\n\n")
+
+            parts.append("STRUCTURE INFO:\n")
+            parts.append(f"  Total atoms: {self._n_total_initial}\n")
+            parts.append(f"  Surface atoms: {self._n_surface}\n")
+            parts.append(f"  Molecule atoms: {self._n_molecule}\n\n")
 
-            text += "STRUCTURE INFO:\n"
-            text += f"  Total atoms: {len(self.optimized_structure)}\n"
-            text += f"  Surface atoms: {len(self.surface_analyzer.surface)}\n"
-            text += f"  Molecule atoms: {len(self.optimized_structure) - len(self.surface_analyzer.surface)}\n\n"
+        parts.append("=" * 80 + "\n")
+        parts.append("Ready to save results\n")
+        text = "".join(parts)
 
-        text += "=" * 80 + "\n"
-        text += "Ready to save results\n"
+        def _apply():
+            self.results_text.delete(1.0, tk.END)
+            self.results_text.insert(1.0, text)
 
-        self.results_text.config(state='normal')
-        self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(1.0, text)
-        self.results_text.config(state='disabled')
+        # Replace the text once the pending redraw is done
+        self.root.after_idle(_apply)
 
     def _save_and_exit(self):
         """Save results and exit"""
@@ -311,36 +373,61 @@ class FinalOptimizationWindow:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             result_dir = os.path.join(self.output_dir, f"GOAD_v1_results_{timestamp}")
             os.makedirs(result_dir, exist_ok=True)
+        except Exception as e:
+            messagebox.showerror("Save Error", f"Could not save results:\n{e}")
+            logger.error(f"Save error: {e}")
+            return
 
-            self._log(f"\nSaving results to: {result_dir}")
+        self._log(f"\nSaving results to: {result_dir}")
 
+        # Write files in the background; report back on the Tk thread
+        self.save_button.config(state=tk.DISABLED)
+        threading.Thread(target=self._do_save, args=(result_dir, timestamp), daemon=True).start()
+
+    def _do_save(self, result_dir: str, timestamp: str):
+        """Write structure and summary files (worker thread)"""
+        try:
             # Save structure
             structure_file = os.path.join(result_dir, "final_optimized_structure.cif")
-            write(structure_file, self.optimized_structure)
+            write(structure_file, self.optimized_structure, format='cif')
             self._log(f"  ✓ Structure: {structure_file}")
 
             # Save summary
             summary_file = os.path.join(result_dir, "summary.txt")
+            parts = [
+                "GOAD v1.0 - FINAL RESULTS\n",
+                "=" * 60 + "\n\n",
+                f"Optimization Date: {timestamp}\n",
+                f"Final Energy (E_ads): {self.final_energy:.4f} eV\n",
+                f"GA Best Energy: {self.best_energy:.4f} eV\n",
+                f"Improvement: {self.best_energy - self.final_energy:.4f} eV\n",
+                f"Fixed Layers: {self.n_fixed_layers}\n",
+            ]
             with open(summary_file, 'w') as f:
-                f.write("GOAD v1.0 - FINAL RESULTS\n")
-                f.write("=" * 60 + "\n\n")
-                f.write(f"Optimization Date: {timestamp}\n")
-                f.write(f"Final Energy (E_ads): {self.final_energy:.4f} eV\n")
-                f.write(f"GA Best Energy: {self.best_energy:.4f} eV\n")
-                f.write(f"Improvement: {self.best_energy - self.final_energy:.4f} eV\n")
-                f.write(f"Fixed Layers: {self.n_fixed_layers}\n")
+                f.writelines(parts)
 
             self._log(f"  ✓ Summary: {summary_file}")
 
-            messagebox.showinfo(
-                "Success",
-                f"Results saved to:\n{result_dir}\n\n"
-                f"Final E_ads: {self.final_energy:.4f} eV"
-            )
+        except Exception as e:
+            self.root.after(0, self._on_save_failed, e)
+        else:
+            self.root.after(0, self._on_save_done, result_dir)
+
+    def _on_save_done(self, result_dir: str):
+        """Report saved results (Tk thread)"""
+        self.save_button.config(state=tk.NORMAL)
 
-            self._log("\n✓ All results saved successfully")
-            self._log("GOAD v1.0 workflow complete!")
+        messagebox.showinfo(
+            "Success",
+            f"Results saved to:\n{result_dir}\n\n"
+            f"Final E_ads: {self.final_energy:.4f} eV"
+        )
 
-        except Exception as e:
-            messagebox.showerror("Save Error", f"Could not save results:\n{e}")
-            logger.error(f"Save error: {e}")
+        self._log("\n✓ All results saved successfully")
+        self._log("GOAD v1.0 workflow complete!")
+
+    def _on_save_failed(self, error: Exception):
+        """Report a failed save (Tk thread)"""
+        self.save_button.config(state=tk.NORMAL)
+        messagebox.showerror("Save Error", f"Could not save results:\n{error}")
+        logger.error(f"Save error: {error}")
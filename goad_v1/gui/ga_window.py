@@ -6,13 +6,20 @@ Runs GA with fixed surface and free molecule
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
+import numpy as np
+import hashlib
+import os
+import sys
+from functools import partial
 import threading
+import queue
 import logging
 
 from ..ga.genetic_algorithm import GeneticAlgorithm
+from ..ga._kernels import warm_up as warm_up_kernels
+from ..utils.fitness_cache import LRUCache, SQLiteFitnessCache
+from ..utils.structure_cache import DEFAULT_CACHE_DIR, structure_hash
+from ..utils.calculator_manager import CalculatorManager
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +28,8 @@ class GAWindow:
     """Window for genetic algorithm optimization"""
 
     def __init__(self, root, surface_relaxed, molecule_relaxed, surface_energy,
-                 molecule_energy, n_fixed_layers, calculator, on_complete_callback=None):
+                 molecule_energy, n_fixed_layers, calculator, on_complete_callback=None,
+                 calculator_type=None):
         """
         Initialize GA window.
 
@@ -34,6 +42,8 @@ class GAWindow:
             n_fixed_layers: Number of fixed layers
             calculator: ASE calculator
             on_complete_callback: Function to call when complete
+            calculator_type: CalculatorManager type of the calculator, lets
+                GA worker processes build their own copy
         """
         self.root = root
         self.root.title("GOAD v1.0 - Genetic Algorithm")
@@ -46,6 +56,7 @@ class GAWindow:
         self.n_fixed_layers = n_fixed_layers
         self.calculator = calculator
         self.on_complete_callback = on_complete_callback
+        self.calculator_type = calculator_type
 
         # GA parameters
         self.ga_params = {
@@ -54,17 +65,36 @@ class GAWindow:
             'mutation_rate': 0.3,
             'crossover_rate': 0.7,
             'elite_size': 5,
+            'n_workers': 1,
         }
 
+        # Structures per batched calculator call (1 = one call per individual)
+        self.batch_size = 1
+
         # GA instance and state
         self.ga = None
         self.running = False
         self.ga_thread = None
         self.ga_results = None
 
+        # Log messages waiting to be shown (filled from any thread,
+        # drained by the Tk event loop)
+        self._log_queue = queue.Queue()
+
+        # Per-generation energies from the GA thread, plotted while it runs
+        self._plot_queue = queue.Queue()
+        self._plot_energies = np.empty(0)
+        self._plot_best_x = []
+        self._plot_best_y = []
+        self._line_all = None
+        self._line_best = None
+
         # Build GUI
         self._build_gui()
 
+        # Compile the GA kernels while the user is still setting parameters
+        threading.Thread(target=warm_up_kernels, daemon=True).start()
+
     def _build_gui(self):
         """Build the GUI layout"""
 
@@ -124,7 +154,19 @@ class GAWindow:
         ttk.Label(params_frame, text="Elite Size:").pack(anchor=tk.W)
         self.elite_spin = ttk.Spinbox(params_frame, from_=1, to=50, width=10)
         self.elite_spin.set(self.ga_params['elite_size'])
-        self.elite_spin.pack(anchor=tk.W)
+        self.elite_spin.pack(anchor=tk.W, pady=(0, 10))
+
+        # Worker processes
+        ttk.Label(params_frame, text="Worker Processes:").pack(anchor=tk.W)
+        self.workers_spin = ttk.Spinbox(params_frame, from_=1, to=os.cpu_count() or 1, width=10)
+        self.workers_spin.set(self.ga_params['n_workers'])
+        self.workers_spin.pack(anchor=tk.W, pady=(0, 10))
+
+        # Batch size
+        ttk.Label(params_frame, text="Batch Size:").pack(anchor=tk.W)
+        self.batch_spin = ttk.Spinbox(params_frame, from_=1, to=256, width=10)
+        self.batch_spin.set(self.batch_size)
+        self.batch_spin.pack(anchor=tk.W)
 
         # Control buttons
         ttk.Button(
@@ -162,6 +204,10 @@ class GAWindow:
         plot_frame = ttk.Frame(self.notebook)
         self.notebook.add(plot_frame, text="📈 Energy Evolution")
 
+        # Matplotlib is only imported once the GA window is opened
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
         self.fig = Figure(figsize=(8, 6), dpi=100)
         self.ax = self.fig.add_subplot(111)
         self.canvas = FigureCanvasTkAgg(self.fig, master=plot_frame)
@@ -192,19 +238,37 @@ class GAWindow:
             width=80,
             wrap=tk.WORD,
             font=('Courier', 10),
-            state='disabled'
+            state='disabled',
+            undo=False
         )
         self.results_text.pack(fill=tk.BOTH, expand=True)
 
+        # Start the log poller
+        self.root.after(50, self._drain_log)
+        self.root.after(500, self._poll_plot)
+
     def _log(self, message: str):
-        """Add message to log"""
-        self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, message + '\n')
-        self.log_text.see(tk.END)
-        self.log_text.config(state='disabled')
-        self.root.update()
+        """Add message to log (safe to call from worker threads)"""
+        self._log_queue.put(message)
         logger.info(message)
 
+    def _drain_log(self, max_batch: int = 1000):
+        """Show up to max_batch queued log messages with a single insert"""
+        batch = []
+        try:
+            while len(batch) < max_batch:
+                batch.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if batch:
+            self.log_text.config(state='normal')
+            self.log_text.insert(tk.END, "\n".join(batch) + "\n")
+            self.log_text.see(tk.END)
+            self.log_text.config(state='disabled')
+
+        self.root.after(50, self._drain_log)
+
     def _run_ga(self):
         """Run the genetic algorithm"""
         try:
@@ -214,6 +278,19 @@ class GAWindow:
             self.ga_params['mutation_rate'] = float(self.mut_spin.get())
             self.ga_params['crossover_rate'] = float(self.cross_spin.get())
             self.ga_params['elite_size'] = int(self.elite_spin.get())
+            self.ga_params['n_workers'] = int(self.workers_spin.get())
+            self.batch_size = int(self.batch_spin.get())
+
+            # Batched inference for MatterSim calculators whose energy is
+            # the potential's alone (batching would drop the D3 term)
+            batch_evaluate = None
+            if self.batch_size > 1 and self.calculator_type is not None:
+                if not CalculatorManager.supports_batch_evaluate(self.calculator_type):
+                    self._log(f"Batched inference is not available for "
+                              f"{self.calculator_type}, evaluating one structure at a time")
+                else:
+                    batch_evaluate = partial(CalculatorManager.batch_evaluate, self.calculator,
+                                             batch_size=self.batch_size)
 
             # Create GA instance
             self.ga = GeneticAlgorithm(
@@ -224,9 +301,15 @@ class GAWindow:
                 molecule_energy=self.molecule_energy,
                 n_fixed_layers=self.n_fixed_layers,
                 **self.ga_params,
+                calculator_spec=self.calculator_type,
+                batch_evaluate=batch_evaluate,
+                cache=self._make_fitness_cache(),
+                progress_callback=lambda gen, energies: self._plot_queue.put(energies),
                 verbose=True
             )
 
+            self._start_plot()
+
             # Run in separate thread
             self.running = True
             self.stop_button.config(state=tk.NORMAL)
@@ -243,8 +326,67 @@ class GAWindow:
             messagebox.showerror("Error", f"Could not start GA:\n{e}")
             logger.error(f"GA error: {e}")
 
+    def _make_fitness_cache(self) -> LRUCache:
+        """
+        Fitness cache of this run.
+
+        With a known calculator type, evaluations are also stored on disk,
+        keyed by calculator, structures and reference energies, so reruns
+        with other GA parameters reuse them.
+        """
+        if self.calculator_type is None:
+            return LRUCache(maxsize=4096)
+
+        namespace = hashlib.sha256("|".join([
+            self.calculator_type,
+            structure_hash(self.surface),
+            structure_hash(self.molecule),
+            repr(float(self.surface_energy)),
+            repr(float(self.molecule_energy)),
+        ]).encode()).hexdigest()
+        try:
+            return SQLiteFitnessCache(DEFAULT_CACHE_DIR / "fitness.sqlite", namespace,
+                                      maxsize=4096)
+        except Exception as e:
+            logger.warning(f"Fitness cache on disk not available: {e}")
+            return LRUCache(maxsize=4096)
+
+    @staticmethod
+    def _yield_to_tk():
+        """
+        Keep the calling (GA) thread off core 0 and below Tk's priority.
+
+        Both are Linux per-thread settings; elsewhere, or without the
+        needed permissions, the thread runs unchanged. Torch's intra-op
+        thread count is process-wide and is also lowered to match.
+
+        Returns:
+            Previous torch thread count to restore after the run, or None
+        """
+        torch_threads = None
+        n_cpus = os.cpu_count() or 1
+        if n_cpus > 1 and hasattr(os, 'sched_setaffinity'):
+            try:
+                os.sched_setaffinity(0, set(range(1, n_cpus)))
+            except OSError as e:
+                logger.debug(f"Could not set GA thread affinity: {e}")
+
+            torch = sys.modules.get('torch')
+            if torch is not None:
+                torch_threads = torch.get_num_threads()
+                torch.set_num_threads(n_cpus - 1)
+
+        if hasattr(os, 'nice'):
+            try:
+                os.nice(5)
+            except OSError as e:
+                logger.debug(f"Could not lower GA thread priority: {e}")
+
+        return torch_threads
+
     def _run_ga_thread(self):
         """Run GA in thread"""
+        torch_threads = self._yield_to_tk()
         try:
             self.ga_results = self.ga.run()
 
@@ -253,17 +395,27 @@ class GAWindow:
             self._log("GA COMPLETED SUCCESSFULLY")
             self._log("=" * 80)
 
-            self._display_results()
-            self.next_button.config(state=tk.NORMAL)
+            # Tk is only touched from its own thread
+            self.root.after(0, self._on_ga_finished)
 
         except Exception as e:
             self._log(f"\nERROR: {e}")
-            messagebox.showerror("GA Error", f"Error during GA execution:\n{e}")
             logger.error(f"GA execution error: {e}")
+            self.root.after(0, messagebox.showerror, "GA Error",
+                            f"Error during GA execution:\n{e}")
 
         finally:
+            if torch_threads is not None:
+                sys.modules['torch'].set_num_threads(torch_threads)
+            if isinstance(self.ga.cache, SQLiteFitnessCache):
+                self.ga.cache.close()
             self.running = False
-            self.stop_button.config(state=tk.DISABLED)
+            self.root.after(0, lambda: self.stop_button.config(state=tk.DISABLED))
+
+    def _on_ga_finished(self):
+        """Show the results of a finished GA run (Tk thread)"""
+        self._display_results()
+        self.next_button.config(state=tk.NORMAL)
 
     def _stop_ga(self):
         """Stop the GA"""
@@ -271,28 +423,81 @@ class GAWindow:
         self._log("\nGA stopped by user")
         self.stop_button.config(state=tk.DISABLED)
 
-    def _display_results(self):
-        """Display GA results"""
-        if not self.ga_results:
-            return
-
-        # Plot energy evolution
-        fitness_history = self.ga_results['fitness_history']
-        generations = self.ga_results['generations']
+    def _start_plot(self):
+        """Clear the plot and create the (empty) lines updated during the run"""
+        self._plot_queue = queue.Queue()
+        self._plot_energies = np.empty(0)
+        self._plot_best_x = []
+        self._plot_best_y = []
 
         self.ax.clear()
-        self.ax.plot(fitness_history, 'b-', linewidth=1, alpha=0.5, label='Evaluation')
-        self.ax.plot(range(0, len(fitness_history), self.ga_params['population_size']),
-                    [min(fitness_history[i:i+self.ga_params['population_size']])
-                     for i in range(0, len(fitness_history), self.ga_params['population_size'])],
-                    'r-', linewidth=2, label='Best per generation')
+        self._line_all, = self.ax.plot([], [], 'b-', linewidth=1, alpha=0.5,
+                                       label='Evaluation')
+        self._line_best, = self.ax.plot([], [], 'r-', linewidth=2,
+                                        label='Best per generation')
         self.ax.set_xlabel('Evaluation Number')
         self.ax.set_ylabel('Adsorption Energy (eV)')
         self.ax.set_title('GA Energy Evolution')
         self.ax.grid(True, alpha=0.3)
         self.ax.legend()
+        self.canvas.draw_idle()
+
+    def _update_plot(self) -> bool:
+        """
+        Append the queued generations to the plot lines.
+
+        Returns:
+            True if new data was plotted
+        """
+        chunks = []
+        try:
+            while True:
+                chunks.append(self._plot_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if self._line_all is None or not chunks:
+            return False
+
+        # Best of every generation, at the index of its first evaluation
+        n = self._plot_energies.size
+        for energies in chunks:
+            if energies.size:
+                self._plot_best_x.append(n)
+                self._plot_best_y.append(energies.min())
+            n += energies.size
+        fh = np.concatenate([self._plot_energies] + chunks)
+        self._plot_energies = fh
+
+        # Plot at most ~5000 evaluation points, with full path simplification
+        import matplotlib as mpl
+        stride = max(1, fh.size // 5000)
+        self._line_all.set_data(np.arange(0, fh.size, stride), fh[::stride])
+        with mpl.rc_context({'path.simplify_threshold': 1.0}):
+            self._line_all.recache(always=True)
+        self._line_best.set_data(self._plot_best_x, self._plot_best_y)
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+        return True
+
+    def _poll_plot(self):
+        """Redraw the plot when the GA thread has queued new generations"""
+        if self._update_plot():
+            self.canvas.draw_idle()
+
+        self.root.after(500, self._poll_plot)
+
+    def _display_results(self):
+        """Display GA results"""
+        if not self.ga_results:
+            return
+
+        # Plot the evaluations still queued by the GA thread
+        fitness_history = self.ga_results['fitness_history']
+        self._update_plot()
         self.fig.tight_layout()
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
         # Display results text
         text = "=" * 80 + "\n"
@@ -301,7 +506,8 @@ class GAWindow:
 
         text += f"Generations completed: {self.ga_results['generations']}\n"
         text += f"Population size: {self.ga_results['population_size']}\n"
-        text += f"Total evaluations: {len(fitness_history)}\n\n"
+        text += f"Total evaluations: {len(fitness_history)}\n"
+        text += f"Cache hits: {self.ga_results.get('cache_hits', 0)}\n\n"
 
         text += "BEST SOLUTION FOUND:\n"
         text += "-" * 80 + "\n"
@@ -321,10 +527,14 @@ class GAWindow:
         text += "\n" + "=" * 80 + "\n"
         text += "Ready for final optimization step (optional)\n"
 
-        self.results_text.config(state='normal')
-        self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(1.0, text)
-        self.results_text.config(state='disabled')
+        def _apply():
+            self.results_text.config(state='normal')
+            self.results_text.delete(1.0, tk.END)
+            self.results_text.insert(1.0, text)
+            self.results_text.config(state='disabled')
+
+        # Replace the text once the pending redraw is done
+        self.root.after_idle(_apply)
 
     def _go_to_final_optimization(self):
         """Proceed to final optimization"""
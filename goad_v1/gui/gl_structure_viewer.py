@@ -0,0 +1,386 @@
+"""
+OpenGL structure viewer for GOAD v1.0
+
+Renders surface and molecule structures offscreen with moderngl and shows
+the finished image in Tk. All atoms are drawn with one instanced sphere
+mesh, so a redraw costs one draw call instead of a matplotlib 3D
+projection and repaint.
+"""
+
+import logging
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+from ase import Atoms
+from ase.data import chemical_symbols, covalent_radii
+from ase.neighborlist import neighbor_list
+from matplotlib.colors import to_rgb
+
+from ..utils.torsion_handler import bond_cutoffs
+from .structure_viewer import ATOM_COLORS
+
+try:
+    import moderngl
+    HAS_MODERNGL = True
+except ImportError:
+    HAS_MODERNGL = False
+
+logger = logging.getLogger(__name__)
+
+_SPHERE_VERTEX_SHADER = """
+#version 330
+uniform mat4 mvp;
+uniform mat3 view_rotation;
+
+in vec3 in_vert;
+in vec3 in_center;
+in float in_radius;
+in vec3 in_color;
+in vec3 in_edge;
+
+out vec3 v_normal;
+out vec3 v_color;
+out vec3 v_edge;
+
+void main() {
+    gl_Position = mvp * vec4(in_center + in_radius * in_vert, 1.0);
+    v_normal = view_rotation * in_vert;
+    v_color = in_color;
+    v_edge = in_edge;
+}
+"""
+
+_SPHERE_FRAGMENT_SHADER = """
+#version 330
+in vec3 v_normal;
+in vec3 v_color;
+in vec3 v_edge;
+
+out vec4 f_color;
+
+void main() {
+    vec3 normal = normalize(v_normal);
+    // Outline where the sphere surface turns away from the viewer
+    if (normal.z < 0.3) {
+        f_color = vec4(v_edge, 1.0);
+        return;
+    }
+    float diffuse = max(dot(normal, normalize(vec3(-0.3, 0.4, 1.0))), 0.0);
+    f_color = vec4(v_color * (0.35 + 0.65 * diffuse), 1.0);
+}
+"""
+
+_LINE_VERTEX_SHADER = """
+#version 330
+uniform mat4 mvp;
+in vec3 in_vert;
+
+void main() {
+    gl_Position = mvp * vec4(in_vert, 1.0);
+}
+"""
+
+_LINE_FRAGMENT_SHADER = """
+#version 330
+out vec4 f_color;
+
+void main() {
+    f_color = vec4(0.25, 0.25, 0.25, 1.0);
+}
+"""
+
+
+def _sphere_mesh(n_lat: int = 12, n_lon: int = 24) -> np.ndarray:
+    """
+    Triangles of a unit UV sphere.
+
+    Args:
+        n_lat: Number of latitude bands
+        n_lon: Number of longitude segments
+
+    Returns:
+        (n_triangles * 3, 3) float32 vertices (also the normals)
+    """
+    theta = np.linspace(0, np.pi, n_lat + 1)
+    phi = np.linspace(0, 2 * np.pi, n_lon + 1)
+    t, p = np.meshgrid(theta, phi, indexing='ij')
+    grid = np.stack([np.sin(t) * np.cos(p), np.sin(t) * np.sin(p), np.cos(t)], axis=-1)
+
+    # Two triangles per grid cell
+    a = grid[:-1, :-1]
+    b = grid[1:, :-1]
+    c = grid[1:, 1:]
+    d = grid[:-1, 1:]
+    triangles = np.concatenate([np.stack([a, b, c], axis=2), np.stack([a, c, d], axis=2)])
+    return triangles.reshape(-1, 3).astype(np.float32)
+
+
+def _view_rotation(elev: float, azim: float) -> np.ndarray:
+    """
+    Rotation from world to camera coordinates (matplotlib's elev/azim convention).
+
+    Args:
+        elev: Elevation angle above the xy plane (degrees)
+        azim: Azimuth angle about the z axis (degrees)
+
+    Returns:
+        3x3 matrix whose rows are the camera right, up and backward axes
+    """
+    elev, azim = np.deg2rad(elev), np.deg2rad(azim)
+    backward = np.array([np.cos(elev) * np.cos(azim), np.cos(elev) * np.sin(azim), np.sin(elev)])
+    right = np.cross([0.0, 0.0, 1.0], backward)
+    right /= np.linalg.norm(right)
+    up = np.cross(backward, right)
+    return np.stack([right, up, backward])
+
+
+class GLStructureViewer:
+    """Structure viewer widget rendered with OpenGL (moderngl)"""
+
+    def __init__(self, parent_frame, width=6, height=5, dpi=100):
+        """
+        Initialize structure viewer.
+
+        Args:
+            parent_frame: Tkinter frame to embed viewer in
+            width: Image width in inches
+            height: Image height in inches
+            dpi: Pixels per inch
+
+        Raises:
+            ImportError: If moderngl is not installed
+            Exception: If no OpenGL 3.3 context can be created
+        """
+        if not HAS_MODERNGL:
+            raise ImportError("moderngl is not installed")
+
+        self.parent = parent_frame
+        self.current_structure = None
+        self.size = (int(width * dpi), int(height * dpi))
+
+        # Created before any widget, so a missing OpenGL context leaves
+        # parent_frame untouched for the matplotlib fallback
+        self.renderer = _SphereRenderer(*self.size)
+        self.elev = 20
+        self.azim = 45
+
+        # Embed in tkinter: title above the rendered image
+        self.title_label = ttk.Label(parent_frame, font=("Arial", 12, "bold"), anchor=tk.CENTER)
+        self.title_label.pack(fill=tk.X)
+        self.image_label = tk.Label(parent_frame, background='white', borderwidth=0)
+        self.image_label.pack(fill=tk.BOTH, expand=True)
+        self._photo = tk.PhotoImage(width=self.size[0], height=self.size[1])
+        self.image_label.configure(image=self._photo)
+        self.image_label.bind('<Configure>', self._on_resize)
+
+        self.atom_colors = dict(ATOM_COLORS)
+
+        # Redraw scheduled by a resize
+        self._pending_redraw = None
+
+    def _rgb_for(self, numbers: np.ndarray) -> np.ndarray:
+        """(N, 3) RGB colors of atoms with the given atomic numbers"""
+        lut = {z: to_rgb(self.atom_colors.get(chemical_symbols[z], '#FF00FF'))
+               for z in np.unique(numbers).tolist()}
+        return np.array([lut[z] for z in numbers.tolist()], dtype=np.float32).reshape(-1, 3)
+
+    def _show(self, title: str):
+        """Render the current scene and put the image in the Tk label"""
+        self.title_label.configure(text=title)
+        self._blit()
+
+    def _blit(self):
+        """Render with the current view angles and update the Tk image"""
+        self._pending_redraw = None
+        image = self.renderer.render(self.elev, self.azim)
+        height, width = image.shape[:2]
+        ppm = b"P6\n%d %d\n255\n" % (width, height) + image.tobytes()
+        self._photo.configure(width=width, height=height, data=ppm, format='PPM')
+
+    def _on_resize(self, event):
+        """Match the framebuffer to the label size and redraw once idle"""
+        size = (max(event.width, 1), max(event.height, 1))
+        if size == self.size:
+            return
+
+        self.size = size
+        self.renderer.resize(*size)
+        if self.renderer.has_scene and self._pending_redraw is None:
+            self._pending_redraw = self.image_label.after_idle(self._blit)
+
+    def display_structure(self, structure: Atoms, title: str = "Structure"):
+        """
+        Display a structure.
+
+        Args:
+            structure: ASE Atoms object
+            title: Title for the plot
+        """
+        self.current_structure = structure
+
+        numbers = structure.numbers
+        radii = np.where(numbers == 1, 0.25, 0.4) * covalent_radii[numbers].clip(0.5, None)
+        self.renderer.set_scene(structure.get_positions(), radii, self._rgb_for(numbers),
+                                np.zeros((len(numbers), 3), dtype=np.float32))
+        self._show(title)
+
+    def display_combined(self, surface: Atoms, molecule: Atoms, title: str = "Combined Structure"):
+        """
+        Display surface and molecule together.
+
+        Args:
+            surface: ASE Atoms object (surface)
+            molecule: ASE Atoms object (molecule)
+            title: Title for the plot
+        """
+        combined = surface + molecule
+        positions = combined.get_positions()
+        numbers = combined.numbers
+        surface_count = len(surface)
+
+        # Larger spheres with black edges for the surface, red edges for the molecule
+        radii = covalent_radii[numbers].clip(0.5, None) * 0.4
+        radii[:surface_count] *= 1.4
+        edges = np.zeros((len(numbers), 3), dtype=np.float32)
+        edges[surface_count:, 0] = 1.0
+
+        # Bonds within the molecule
+        segments = np.empty((0, 2, 3))
+        try:
+            molecule_part = combined[surface_count:]
+            i_arr, j_arr = neighbor_list('ij', molecule_part,
+                                         cutoff=bond_cutoffs(molecule_part.numbers))
+            pairs = i_arr < j_arr  # Each bond once
+            molecule_pos = positions[surface_count:]
+            segments = np.stack([molecule_pos[i_arr[pairs]], molecule_pos[j_arr[pairs]]], axis=1)
+        except Exception:
+            pass  # Bonds not critical for visualization
+
+        self.renderer.set_scene(positions, radii, self._rgb_for(numbers), edges, segments)
+        self._show(title)
+
+    def rotate_view(self, azim: int = 0, elev: int = 0):
+        """Rotate view (re-renders the uploaded scene)"""
+        self.elev = elev
+        self.azim = azim
+        if self.renderer.has_scene:
+            self._blit()
+
+
+class _SphereRenderer:
+    """Offscreen moderngl renderer of spheres (atoms) and lines (bonds)"""
+
+    def __init__(self, width: int, height: int):
+        """
+        Create the GL context, shaders and sphere mesh.
+
+        Args:
+            width: Framebuffer width in pixels
+            height: Framebuffer height in pixels
+        """
+        try:
+            self.ctx = moderngl.create_standalone_context(require=330)
+        except Exception:
+            # No X display (e.g. Wayland or headless): try EGL
+            self.ctx = moderngl.create_standalone_context(require=330, backend='egl')
+
+        self.sphere_program = self.ctx.program(vertex_shader=_SPHERE_VERTEX_SHADER,
+                                               fragment_shader=_SPHERE_FRAGMENT_SHADER)
+        self.line_program = self.ctx.program(vertex_shader=_LINE_VERTEX_SHADER,
+                                             fragment_shader=_LINE_FRAGMENT_SHADER)
+        self.mesh = self.ctx.buffer(_sphere_mesh().tobytes())
+
+        self.fbo = None
+        self.resize(width, height)
+
+        self.has_scene = False
+        self._spheres = None
+        self._lines = None
+        self._instances = None
+        self._segments = None
+
+    def resize(self, width: int, height: int):
+        """Replace the framebuffer with one of the given size"""
+        if self.fbo is not None:
+            self.fbo.release()
+        self.fbo = self.ctx.simple_framebuffer((width, height))
+
+    def set_scene(self, positions: np.ndarray, radii: np.ndarray, colors_rgb: np.ndarray,
+                  edges_rgb: np.ndarray, segments: np.ndarray = None):
+        """
+        Upload the atoms (and bonds) to draw.
+
+        Args:
+            positions: (N, 3) sphere centers
+            radii: (N,) sphere radii
+            colors_rgb: (N, 3) sphere colors
+            edges_rgb: (N, 3) outline colors
+            segments: (M, 2, 3) bond end points (none if None)
+        """
+        instances = np.hstack([positions, radii[:, None], colors_rgb, edges_rgb]).astype('f4')
+        if self._instances is not None:
+            self._instances.release()
+            self._spheres.release()
+        self._instances = self.ctx.buffer(instances.tobytes())
+        self._spheres = self.ctx.vertex_array(self.sphere_program, [
+            (self.mesh, '3f', 'in_vert'),
+            (self._instances, '3f 1f 3f 3f/i', 'in_center', 'in_radius', 'in_color', 'in_edge'),
+        ])
+        self.n_instances = len(positions)
+
+        if self._segments is not None:
+            self._segments.release()
+            self._lines.release()
+            self._segments = self._lines = None
+        if segments is not None and len(segments):
+            self._segments = self.ctx.buffer(np.asarray(segments, dtype='f4').tobytes())
+            self._lines = self.ctx.vertex_array(self.line_program,
+                                                [(self._segments, '3f', 'in_vert')])
+
+        # Cubic box around the atoms (centered on their bounds, so no
+        # sphere is cut off at the image border)
+        max_range = np.ptp(positions, axis=0).max()
+        self.center = (positions.min(axis=0) + positions.max(axis=0)) / 2
+        self.half = max_range / 2 + max_range * 0.1 + radii.max()
+        self.has_scene = True
+
+    def render(self, elev: float, azim: float) -> np.ndarray:
+        """
+        Draw the scene seen from the given view angles.
+
+        Args:
+            elev: Elevation angle (degrees)
+            azim: Azimuth angle (degrees)
+
+        Returns:
+            (height, width, 3) uint8 RGB image, top row first
+        """
+        width, height = self.fbo.size
+        rotation = _view_rotation(elev, azim)
+
+        # Orthographic projection of the box around the atoms
+        aspect = width / height
+        sx, sy = (1 / (self.half * aspect), 1 / self.half) if aspect >= 1 else \
+            (1 / self.half, aspect / self.half)
+        depth = 1 / (2 * self.half)
+        view = np.eye(4)
+        view[:3, :3] = rotation
+        view[:3, 3] = -rotation @ self.center
+        mvp = np.diag([sx, sy, -depth, 1.0]) @ view
+
+        self.fbo.use()
+        self.ctx.viewport = (0, 0, width, height)
+        self.fbo.clear(1.0, 1.0, 1.0, 1.0, depth=1.0)
+        self.ctx.enable(moderngl.DEPTH_TEST)
+
+        # GLSL matrices are column-major
+        self.sphere_program['mvp'].write(mvp.T.astype('f4').tobytes())
+        self.sphere_program['view_rotation'].write(rotation.T.astype('f4').tobytes())
+        self._spheres.render(moderngl.TRIANGLES, instances=self.n_instances)
+        if self._lines is not None:
+            self.line_program['mvp'].write(mvp.T.astype('f4').tobytes())
+            self._lines.render(moderngl.LINES)
+
+        image = np.frombuffer(self.fbo.read(components=3, alignment=1), dtype=np.uint8)
+        return image.reshape(height, width, 3)[::-1]
@@ -7,14 +7,16 @@ Calculates baseline energies for surface and molecule
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 from ase.io import write
-from ase.optimize import BFGS
-from ase.constraints import FixAtoms
+import numpy as np
 import os
+import queue
 from datetime import datetime
 import logging
 from pathlib import Path
 
 from ..utils.calculator_manager import CalculatorManager
+from ..utils.structure_cache import RelaxationCache
+from ._fixed_layers_numba import gather, layer_index_arrays
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,14 @@ logger = logging.getLogger(__name__)
 class ReferenceEnergiesWindow:
     """Window for reference energy calculation"""
 
+    # Optimizers offered for the surface relaxation (ase.optimize class
+    # name -> extra keyword arguments)
+    SURFACE_OPTIMIZERS = {
+        "FIRE": {"dt": 0.1, "maxstep": 0.2},
+        "LBFGSLineSearch": {},
+        "BFGS": {},
+    }
+
     def __init__(self, root, surface, molecule, surface_analyzer, molecule_analyzer,
                  n_fixed_layers, n_total_layers, on_complete_callback=None):
         """
@@ -49,8 +59,15 @@ class ReferenceEnergiesWindow:
         self.n_total_layers = n_total_layers
         self.on_complete_callback = on_complete_callback
 
-        # Calculator (will be set later or passed in)
+        # Calculator (will be set later or passed in) and its type
         self.calculator = None
+        self.calculator_type = None
+
+        # Relaxed references of earlier runs, keyed by structure content
+        self._relax_cache = RelaxationCache()
+
+        # Fixed surface atom indices (n_fixed_layers does not change per window)
+        self._fixed_indices = None
 
         # Results storage
         self.surface_energy = None
@@ -59,6 +76,10 @@ class ReferenceEnergiesWindow:
         self.molecule_relaxed = None
         self.optimize_reference = True
 
+        # Log messages waiting to be shown (filled from any thread,
+        # drained by the Tk event loop)
+        self._log_queue = queue.Queue()
+
         # Build GUI
         self._build_gui()
 
@@ -136,6 +157,38 @@ class ReferenceEnergiesWindow:
         self.calc_info_label.pack(anchor=tk.W, pady=(5, 10))
         self._update_calculator_info()
 
+        # Device selection
+        ttk.Label(left_panel, text="Device:", font=("Arial", 10, "bold")).pack(
+            anchor=tk.W, pady=(10, 5))
+
+        self.device_var = tk.StringVar(value="auto")
+
+        device_frame = ttk.Frame(left_panel)
+        device_frame.pack(fill=tk.X, pady=(0, 10))
+
+        for text, value in (("Auto", "auto"), ("CPU", "cpu"), ("CUDA (GPU)", "cuda")):
+            ttk.Radiobutton(
+                device_frame,
+                text=text,
+                variable=self.device_var,
+                value=value
+            ).pack(side=tk.LEFT, padx=(0, 10))
+
+        # Inference precision
+        self.precision_var = tk.StringVar(value="fp32")
+
+        precision_frame = ttk.Frame(left_panel)
+        precision_frame.pack(fill=tk.X, pady=(0, 10))
+
+        ttk.Label(precision_frame, text="Precision:").pack(side=tk.LEFT, padx=(0, 10))
+        for text, value in (("FP32", "fp32"), ("BF16", "bf16")):
+            ttk.Radiobutton(
+                precision_frame,
+                text=text,
+                variable=self.precision_var,
+                value=value
+            ).pack(side=tk.LEFT, padx=(0, 10))
+
         # Relaxation option
         ttk.Label(left_panel, text="Reference Structures:", font=("Arial", 10, "bold")).pack(
             anchor=tk.W, pady=(10, 5))
@@ -144,7 +197,7 @@ class ReferenceEnergiesWindow:
 
         ttk.Radiobutton(
             left_panel,
-            text="Relax both (0-1000 steps)",
+            text="Relax both (0-200 steps)",
             variable=self.relax_var,
             value=True
         ).pack(anchor=tk.W, pady=2)
@@ -156,21 +209,36 @@ class ReferenceEnergiesWindow:
             value=False
         ).pack(anchor=tk.W, pady=2)
 
+        # Surface optimizer
+        optimizer_frame = ttk.Frame(left_panel)
+        optimizer_frame.pack(fill=tk.X, pady=(5, 0))
+
+        ttk.Label(optimizer_frame, text="Surface optimizer:").pack(side=tk.LEFT)
+        self.optimizer_var = tk.StringVar(value="FIRE")
+        ttk.Combobox(
+            optimizer_frame,
+            textvariable=self.optimizer_var,
+            values=list(self.SURFACE_OPTIMIZERS),
+            state="readonly",
+            width=16
+        ).pack(side=tk.LEFT, padx=(5, 0))
+
         ttk.Label(
             left_panel,
             text="• Surface: respects fixed layers\n"
-                 "• Molecule: fully relaxed",
+                 "• Molecule: fully relaxed (LBFGS line search)",
             font=("Arial", 9),
             foreground="gray",
             justify=tk.LEFT
         ).pack(anchor=tk.W, pady=(10, 0))
 
         # Calculate button
-        ttk.Button(
+        self.calculate_button = ttk.Button(
             left_panel,
             text="Calculate References",
             command=self._calculate_references
-        ).pack(fill=tk.X, pady=(20, 0))
+        )
+        self.calculate_button.pack(fill=tk.X, pady=(20, 0))
 
         # Next button
         self.next_button = ttk.Button(
@@ -213,10 +281,14 @@ class ReferenceEnergiesWindow:
             width=60,
             wrap=tk.WORD,
             font=('Courier', 10),
-            state='disabled'
+            state='disabled',
+            undo=False
         )
         self.results_text.pack(fill=tk.BOTH, expand=True)
 
+        # Start the log poller
+        self.root.after(50, self._drain_log)
+
     def _update_calculator_info(self):
         """Update calculator info label"""
         calc_type = self.calculator_var.get()
@@ -227,28 +299,64 @@ class ReferenceEnergiesWindow:
             self.calc_info_label.config(text=info_text)
 
     def _log(self, message: str):
-        """Add message to log"""
-        self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, message + '\n')
-        self.log_text.see(tk.END)
-        self.log_text.config(state='disabled')
+        """Add message to log (safe to call from worker threads)"""
+        self._log_queue.put(message)
         logger.info(message)
 
-    def _calculate_references(self):
-        """Calculate reference energies"""
-        # Load selected calculator
+    def _drain_log(self, max_batch: int = 1000):
+        """Show up to max_batch queued log messages with a single insert"""
+        batch = []
         try:
-            calc_type = self.calculator_var.get()
-            self._log(f"Loading calculator: {calc_type.upper()}...")
-            self.calculator = CalculatorManager.get_calculator(calc_type)
-            self._log("✓ Calculator loaded successfully\n")
-        except Exception as e:
-            messagebox.showerror(
-                "Calculator Error",
-                f"Could not load calculator:\n{e}"
-            )
-            self._log(f"ERROR loading calculator: {e}")
-            return
+            while len(batch) < max_batch:
+                batch.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if batch:
+            self.log_text.config(state='normal')
+            self.log_text.insert(tk.END, "\n".join(batch) + "\n")
+            self.log_text.see(tk.END)
+            self.log_text.config(state='disabled')
+
+        self.root.after(50, self._drain_log)
+
+    def _calculate_references(self):
+        """Calculate reference energies (loads the calculator off the Tk thread)"""
+        calc_type = self.calculator_var.get()
+        device = self.device_var.get()
+        precision = self.precision_var.get()
+
+        self.calculate_button.config(state=tk.DISABLED)
+        self.next_button.config(state=tk.DISABLED)
+        self._log(f"Loading calculator: {calc_type.upper()} ({device}, {precision.upper()})...")
+
+        # Precision and device are part of the type so that cached relaxations
+        # and GA worker calculators match the loaded calculator
+        loaded_type = calc_type if precision == "fp32" else f"{calc_type}:{precision}"
+        if device != "auto":
+            loaded_type = f"{loaded_type}@{device}"
+        CalculatorManager.get_calculator_async(
+            self.root, calc_type,
+            on_done=lambda calculator: self._after_calc_loaded(calculator, loaded_type),
+            on_error=self._on_calc_load_failed,
+            device=None if device == "auto" else device,
+            precision=precision
+        )
+
+    def _on_calc_load_failed(self, error: Exception):
+        """Report a calculator loading error (Tk thread)"""
+        self._log(f"ERROR loading calculator: {error}")
+        messagebox.showerror(
+            "Calculator Error",
+            f"Could not load calculator:\n{error}"
+        )
+        self.calculate_button.config(state=tk.NORMAL)
+
+    def _after_calc_loaded(self, calculator, calc_type: str):
+        """Run the reference calculation once the calculator is loaded (Tk thread)"""
+        self.calculator = calculator
+        self.calculator_type = calc_type
+        self._log("✓ Calculator loaded successfully\n")
 
         self._log("=" * 60)
         self._log("REFERENCE ENERGY CALCULATION")
@@ -258,7 +366,7 @@ class ReferenceEnergiesWindow:
             self.optimize_reference = self.relax_var.get()
 
             if self.optimize_reference:
-                self._log("\nMode: RELAXATION (0-1000 steps max)")
+                self._log("\nMode: RELAXATION (0-200 steps max)")
                 self._log("• Surface: relaxed with fixed layers")
                 self._log("• Molecule: fully relaxed\n")
                 self._calculate_with_relaxation()
@@ -276,94 +384,120 @@ class ReferenceEnergiesWindow:
             self._log(f"ERROR: {e}")
             logger.error(f"Calculation error: {e}")
 
+        finally:
+            self.calculate_button.config(state=tk.NORMAL)
+
     def _calculate_with_relaxation(self):
         """Calculate with relaxation"""
-        self._log("\n[1/2] Calculating surface reference...")
-
-        # Surface copy with fixed layers
-        surface_copy = self.surface.copy()
-        surface_copy.set_calculator(self.calculator)
+        # Imported here so the earlier wizard steps do not pay for them
+        import ase.optimize
+        from ase.constraints import FixAtoms
 
-        # Fix the specified number of layers from bottom
-        self._log(f"  Fixing bottom {self.n_fixed_layers} layers...")
-        fixed_indices = self._get_fixed_layer_indices()
+        fmax = 0.05
 
-        if fixed_indices:
-            surface_copy.set_constraint(FixAtoms(indices=fixed_indices))
+        self._log("\n[1/2] Calculating surface reference...")
 
-        # Relax
-        self._log("  Optimizing surface...")
-        opt = BFGS(surface_copy, logfile=None)
-        opt.run(fmax=0.05, steps=1000)
+        optimizer = self.optimizer_var.get()
+        cached = self._get_cached_relaxation(self.surface, self.n_fixed_layers, fmax, optimizer)
+        if cached is not None:
+            surface_copy, self.surface_energy = cached
+            self._log("  Using cached relaxation of this surface")
+        else:
+            # Surface copy with fixed layers
+            surface_copy = self.surface.copy()
+            surface_copy.set_calculator(self.calculator)
+
+            # Fix the specified number of layers from bottom
+            self._log(f"  Fixing bottom {self.n_fixed_layers} layers...")
+            fixed_indices = self._get_fixed_layer_indices()
+
+            if len(fixed_indices) > 0:
+                surface_copy.set_constraint(FixAtoms(indices=fixed_indices))
+
+            # Relax
+            self._log(f"  Optimizing surface ({optimizer})...")
+            opt = getattr(ase.optimize, optimizer)(
+                surface_copy, logfile=None, **self.SURFACE_OPTIMIZERS[optimizer])
+            opt.run(fmax=fmax, steps=200)
+
+            self.surface_energy = surface_copy.get_potential_energy()
+            self._store_relaxation(self.surface, self.n_fixed_layers, fmax, optimizer,
+                                   surface_copy, self.surface_energy)
 
-        self.surface_energy = surface_copy.get_potential_energy()
         self.surface_relaxed = surface_copy
         self._log(f"  ✓ E_surface = {self.surface_energy:.4f} eV")
 
         self._log("\n[2/2] Calculating molecule reference...")
-        molecule_copy = self.molecule.copy()
-        molecule_copy.set_calculator(self.calculator)
 
-        self._log("  Optimizing molecule (fully free)...")
-        opt = BFGS(molecule_copy, logfile=None)
-        opt.run(fmax=0.05, steps=1000)
+        molecule_optimizer = "LBFGSLineSearch"
+        cached = self._get_cached_relaxation(self.molecule, 0, fmax, molecule_optimizer)
+        if cached is not None:
+            molecule_copy, self.molecule_energy = cached
+            self._log("  Using cached relaxation of this molecule")
+        else:
+            molecule_copy = self.molecule.copy()
+            molecule_copy.set_calculator(self.calculator)
+
+            self._log("  Optimizing molecule (fully free)...")
+            opt = getattr(ase.optimize, molecule_optimizer)(molecule_copy, logfile=None)
+            opt.run(fmax=fmax, steps=200)
+
+            self.molecule_energy = molecule_copy.get_potential_energy()
+            self._store_relaxation(self.molecule, 0, fmax, molecule_optimizer,
+                                   molecule_copy, self.molecule_energy)
 
-        self.molecule_energy = molecule_copy.get_potential_energy()
         self.molecule_relaxed = molecule_copy
         self._log(f"  ✓ E_molecule = {self.molecule_energy:.4f} eV")
 
-    def _calculate_single_point(self):
-        """Calculate single point energies - NO relaxation, pure energy calculation"""
-        from ase.constraints import FixAtoms
-        import numpy as np
-
-        self._log("\n[1/2] Calculating surface single-point (FIXED)...")
+    def _get_cached_relaxation(self, atoms, n_fixed_layers: int, fmax: float, optimizer: str):
+        """Cached (relaxed structure, energy) for atoms, or None"""
+        if self.calculator_type is None:
+            return None
 
-        surface_copy = self.surface.copy()
-        surface_original_pos = surface_copy.get_positions().copy()
+        cached = self._relax_cache.get(atoms, self.calculator_type, n_fixed_layers, fmax,
+                                       optimizer)
+        if cached is not None:
+            cached[0].calc = self.calculator
+        return cached
 
-        # Fix ALL atoms to prevent any movement/relaxation
-        surface_copy.set_constraint(FixAtoms(indices=range(len(surface_copy))))
-        surface_copy.set_calculator(self.calculator)
-        self.surface_energy = surface_copy.get_potential_energy()
-        surface_final_pos = surface_copy.get_positions()
+    def _store_relaxation(self, atoms, n_fixed_layers: int, fmax: float, optimizer: str,
+                          relaxed, energy: float):
+        """Store a relaxation result in the on-disk cache"""
+        if self.calculator_type is not None:
+            self._relax_cache.put(atoms, self.calculator_type, n_fixed_layers, fmax,
+                                  optimizer, relaxed, energy)
 
-        # Verify no movement
-        pos_change_surface = np.max(np.abs(surface_final_pos - surface_original_pos))
-        self._log(f"  Position change: {pos_change_surface:.4e} Å")
+    def _calculate_single_point(self):
+        """Calculate single point energies - NO relaxation, pure energy calculation"""
+        # No optimizer runs here, so the input structures are evaluated as-is
+        self._log("\n[1/2] Calculating surface single-point (FIXED)...")
 
-        self.surface_relaxed = surface_copy
+        self.surface.calc = self.calculator
+        self.surface_energy = self.surface.get_potential_energy()
+        self.surface_relaxed = self.surface
         self._log(f"  E_surface = {self.surface_energy:.4f} eV")
 
         self._log("\n[2/2] Calculating molecule single-point (FIXED)...")
 
-        molecule_copy = self.molecule.copy()
-        molecule_original_pos = molecule_copy.get_positions().copy()
-
-        # Fix ALL atoms to prevent any movement/relaxation
-        molecule_copy.set_constraint(FixAtoms(indices=range(len(molecule_copy))))
-        molecule_copy.set_calculator(self.calculator)
-        self.molecule_energy = molecule_copy.get_potential_energy()
-        molecule_final_pos = molecule_copy.get_positions()
-
-        # Verify no movement
-        pos_change_molecule = np.max(np.abs(molecule_final_pos - molecule_original_pos))
-        self._log(f"  Position change: {pos_change_molecule:.4e} Å")
-
-        self.molecule_relaxed = molecule_copy
+        self.molecule.calc = self.calculator
+        self.molecule_energy = self.molecule.get_potential_energy()
+        self.molecule_relaxed = self.molecule
         self._log(f"  E_molecule = {self.molecule_energy:.4f} eV")
 
-    def _get_fixed_layer_indices(self) -> list:
+    def _get_fixed_layer_indices(self) -> np.ndarray:
         """Get indices of atoms to fix (bottom N layers)"""
-        layers_info = self.surface_analyzer._info.get('layers', {}).get('layers_list', [])
+        if self._fixed_indices is not None:
+            return self._fixed_indices
+
+        offsets, flat_indices = layer_index_arrays(self.surface_analyzer)
+        n_analyzed = len(offsets) - 1
 
-        # Get the bottom N layers
-        fixed_indices = []
-        for i in range(self.n_total_layers - self.n_fixed_layers, self.n_total_layers):
-            if i < len(layers_info):
-                fixed_indices.extend(layers_info[i]['atom_indices'])
+        # Layers are ordered top to bottom, so the fixed ones are the last N
+        end = min(self.n_total_layers, n_analyzed)
+        start = min(max(self.n_total_layers - self.n_fixed_layers, 0), end)
+        self._fixed_indices = gather(offsets, flat_indices, start, end)
 
-        return fixed_indices
+        return self._fixed_indices
 
     def _display_results(self):
         """Display results in the results tab"""
@@ -384,10 +518,14 @@ class ReferenceEnergiesWindow:
         text += "These energies will be used to calculate:\n"
         text += "E_adsorption = E_system - (E_surface + E_molecule)\n"
 
-        self.results_text.config(state='normal')
-        self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(1.0, text)
-        self.results_text.config(state='disabled')
+        def _apply():
+            self.results_text.config(state='normal')
+            self.results_text.delete(1.0, tk.END)
+            self.results_text.insert(1.0, text)
+            self.results_text.config(state='disabled')
+
+        # Replace the text once the pending redraw is done
+        self.root.after_idle(_apply)
 
     def _go_to_ga(self):
         """Proceed to genetic algorithm"""
@@ -402,7 +540,8 @@ class ReferenceEnergiesWindow:
                 surface_energy=self.surface_energy,
                 molecule_energy=self.molecule_energy,
                 n_fixed_layers=self.n_fixed_layers,
-                calculator=self.calculator
+                calculator=self.calculator,
+                calculator_type=self.calculator_type
             )
 
     def set_calculator(self, calculator):
@@ -4,14 +4,62 @@
 Displays surface and molecule structures using matplotlib
 """
 
+import logging
 import tkinter as tk
 from tkinter import ttk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+from matplotlib.colors import to_rgba
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 import numpy as np
 from ase import Atoms
-from ase.data import colors
+from ase.data import atomic_numbers, chemical_symbols, colors
+from ase.neighborlist import neighbor_list
+
+from ..utils.torsion_handler import bond_cutoffs
+
+logger = logging.getLogger(__name__)
+
+# Colors for atoms
+ATOM_COLORS = {
+    'H': '#FFFFFF',
+    'C': '#909090',
+    'N': '#3050F8',
+    'O': '#FF0D0D',
+    'S': '#FFFF30',
+    'P': '#FF8000',
+    'Cu': '#B87333',
+    'Pt': '#E195B5',
+    'Au': '#FFD700',
+    'Ag': '#C0C0C0',
+    'Al': '#C8C8C8',
+}
+
+
+def create_structure_viewer(parent_frame, backend: str = "mpl", **kwargs):
+    """
+    Structure viewer with the chosen rendering backend.
+
+    Args:
+        parent_frame: Tkinter frame to embed viewer in
+        backend: "mpl" (matplotlib 3D axes) or "gl" (OpenGL via moderngl;
+            falls back to matplotlib when moderngl or an OpenGL context
+            is unavailable)
+        kwargs: width, height and dpi, as for StructureViewer
+
+    Returns:
+        StructureViewer or GLStructureViewer (same display methods)
+    """
+    if backend == "gl":
+        from .gl_structure_viewer import GLStructureViewer
+
+        try:
+            return GLStructureViewer(parent_frame, **kwargs)
+        except Exception as e:
+            logger.info(f"OpenGL viewer unavailable, using matplotlib: {e}")
+
+    return StructureViewer(parent_frame, **kwargs)
 
 
 class StructureViewer:
@@ -38,21 +86,97 @@ class StructureViewer:
         self.canvas = FigureCanvasTkAgg(self.fig, master=parent_frame)
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.pack(fill=tk.BOTH, expand=True)
+        self.canvas.draw_idle()
 
         # Colors for atoms
-        self.atom_colors = {
-            'H': '#FFFFFF',
-            'C': '#909090',
-            'N': '#3050F8',
-            'O': '#FF0D0D',
-            'S': '#FFFF30',
-            'P': '#FF8000',
-            'Cu': '#B87333',
-            'Pt': '#E195B5',
-            'Au': '#FFD700',
-            'Ag': '#C0C0C0',
-            'Al': '#C8C8C8',
-        }
+        self.atom_colors = dict(ATOM_COLORS)
+
+        # RGBA palette indexed by atomic number (magenta for elements
+        # without a color), and the colors of the last structures drawn
+        self._palette_rgba = np.tile(to_rgba('#FF00FF'), (len(chemical_symbols), 1))
+        for symbol, hex_color in self.atom_colors.items():
+            self._palette_rgba[atomic_numbers[symbol]] = to_rgba(hex_color)
+        self._color_cache = {}
+
+        # Artists kept across redraws (updated in place instead of ax.clear())
+        self._mode = None
+        self._artists = {}
+        self._labels_set = False
+
+    def _colors_for(self, numbers: np.ndarray) -> np.ndarray:
+        """(N, 4) RGBA colors of atoms with the given atomic numbers"""
+        key = numbers.tobytes()
+        colors_rgba = self._color_cache.get(key)
+        if colors_rgba is None:
+            colors_rgba = np.take(self._palette_rgba, numbers, axis=0)
+            if len(self._color_cache) >= 8:
+                self._color_cache.clear()
+            self._color_cache[key] = colors_rgba
+        return colors_rgba
+
+    def _set_mode(self, mode: str):
+        """
+        Remove the artists of the other display mode.
+
+        Args:
+            mode: "single" (display_structure) or "combined" (display_combined)
+        """
+        if self._mode == mode:
+            return
+
+        for artist in self._artists.values():
+            artist.remove()
+        self._artists = {}
+        self._mode = mode
+
+    def _scatter(self, name: str, positions: np.ndarray, colors_rgba: np.ndarray,
+                 sizes, **style):
+        """
+        Create or update the named scatter artist.
+
+        Args:
+            name: Artist name (one artist per name is kept across redraws)
+            positions: (N, 3) atom positions
+            colors_rgba: (N, 4) face colors
+            sizes: Marker sizes (scalar or (N,))
+            style: Fixed scatter style used when the artist is created
+        """
+        artist = self._artists.get(name)
+        if artist is None:
+            self._artists[name] = self.ax.scatter(
+                positions[:, 0], positions[:, 1], positions[:, 2],
+                c=colors_rgba, s=sizes, **style)
+            return
+
+        artist.set_offsets(positions[:, :2])
+        artist.set_facecolors(colors_rgba)
+        artist.set_sizes(np.broadcast_to(sizes, len(positions)))
+        artist.set_3d_properties(positions[:, 2], 'z')
+
+    def _finish_view(self, positions: np.ndarray, title: str):
+        """Title, cubic limits around the atoms and the default view angle"""
+        self.ax.set_title(title, fontsize=12, fontweight='bold')
+
+        if not self._labels_set:
+            self.ax.set_xlabel('X (Å)')
+            self.ax.set_ylabel('Y (Å)')
+            self.ax.set_zlabel('Z (Å)')
+
+        # Cubic box around the atoms (equal aspect ratio)
+        max_range = np.ptp(positions, axis=0).max()
+        center = positions.mean(axis=0)
+        half = max_range / 2 + max_range * 0.1
+        self.ax.set_xlim(center[0] - half, center[0] + half)
+        self.ax.set_ylim(center[1] - half, center[1] + half)
+        self.ax.set_zlim(center[2] - half, center[2] + half)
+
+        # Rotate view slightly for better visualization
+        self.ax.view_init(elev=20, azim=45)
+
+        if not self._labels_set:
+            self.fig.tight_layout()
+            self._labels_set = True
+        self.canvas.draw_idle()
 
     def display_structure(self, structure: Atoms, title: str = "Structure"):
         """
@@ -63,56 +187,21 @@ class StructureViewer:
             title: Title for the plot
         """
         self.current_structure = structure
+        self._set_mode("single")
 
-        self.ax.clear()
-
-        positions = structure.get_positions()
-        symbols = structure.get_chemical_symbols()
-
-        # Plot atoms
-        for symbol, pos in zip(symbols, positions):
-            color = self.atom_colors.get(symbol, '#FF00FF')
-
-            # Atom size based on type
-            size = 100 if symbol != 'H' else 50
-
-            self.ax.scatter(
-                [pos[0]], [pos[1]], [pos[2]],
-                c=color,
-                s=size,
-                edgecolors='black',
-                linewidth=0.5,
-                alpha=0.8
-            )
-
-        # Set labels and title
-        self.ax.set_xlabel('X (Å)')
-        self.ax.set_ylabel('Y (Å)')
-        self.ax.set_zlabel('Z (Å)')
-        self.ax.set_title(title, fontsize=12, fontweight='bold')
-
-        # Set aspect ratio
         positions = structure.get_positions()
-        x_range = positions[:, 0].max() - positions[:, 0].min()
-        y_range = positions[:, 1].max() - positions[:, 1].min()
-        z_range = positions[:, 2].max() - positions[:, 2].min()
-
-        max_range = max(x_range, y_range, z_range)
-
-        center_x = positions[:, 0].mean()
-        center_y = positions[:, 1].mean()
-        center_z = positions[:, 2].mean()
+        numbers = structure.numbers
 
-        margin = max_range * 0.1
-        self.ax.set_xlim(center_x - max_range/2 - margin, center_x + max_range/2 + margin)
-        self.ax.set_ylim(center_y - max_range/2 - margin, center_y + max_range/2 + margin)
-        self.ax.set_zlim(center_z - max_range/2 - margin, center_z + max_range/2 + margin)
+        # Plot atoms (one artist for all of them); atom size based on type
+        self._scatter(
+            "atoms", positions, self._colors_for(numbers),
+            np.where(numbers == 1, 50, 100),
+            edgecolors='black',
+            linewidth=0.5,
+            alpha=0.8
+        )
 
-        # Rotate view slightly for better visualization
-        self.ax.view_init(elev=20, azim=45)
-
-        self.fig.tight_layout()
-        self.canvas.draw()
+        self._finish_view(positions, title)
 
     def display_combined(self, surface: Atoms, molecule: Atoms, title: str = "Combined Structure"):
         """
@@ -125,102 +214,56 @@ class StructureViewer:
         """
         # Combine for visualization
         combined = surface + molecule
-
-        # Mark surface atoms with larger size
-        self.ax.clear()
+        self._set_mode("combined")
 
         positions = combined.get_positions()
-        symbols = combined.get_chemical_symbols()
+        numbers = combined.numbers
 
         surface_count = len(surface)
 
         # Plot surface atoms
-        for i in range(surface_count):
-            symbol = symbols[i]
-            pos = positions[i]
-            color = self.atom_colors.get(symbol, '#FF00FF')
-
-            self.ax.scatter(
-                [pos[0]], [pos[1]], [pos[2]],
-                c=color,
-                s=200,  # Larger for surface
-                edgecolors='black',
-                linewidth=1,
-                alpha=0.9,
-                marker='o'
-            )
+        self._scatter(
+            "surface", positions[:surface_count], self._colors_for(numbers[:surface_count]),
+            200,  # Larger for surface
+            edgecolors='black',
+            linewidth=1,
+            alpha=0.9,
+            marker='o'
+        )
 
         # Plot molecule atoms
-        for i in range(surface_count, len(combined)):
-            symbol = symbols[i]
-            pos = positions[i]
-            color = self.atom_colors.get(symbol, '#FF00FF')
-
-            self.ax.scatter(
-                [pos[0]], [pos[1]], [pos[2]],
-                c=color,
-                s=100,  # Smaller for molecule
-                edgecolors='red',
-                linewidth=0.5,
-                alpha=0.8,
-                marker='o'
-            )
-
-        # Draw bonds in molecule
+        molecule_pos = positions[surface_count:]
+        self._scatter(
+            "molecule", molecule_pos, self._colors_for(numbers[surface_count:]),
+            100,  # Smaller for molecule
+            edgecolors='red',
+            linewidth=0.5,
+            alpha=0.8,
+            marker='o'
+        )
+
+        # Draw bonds within the molecule as a single collection
+        segments = np.empty((0, 2, 3))
         try:
-            from ase.neighborlist import neighbor_list
-            i_arr, j_arr = neighbor_list('ij', combined, cutoff=1.6)
-
-            for idx_pair in range(len(i_arr)):
-                atom_i = int(i_arr[idx_pair])
-                atom_j = int(j_arr[idx_pair])
-
-                # Only draw bonds within molecule or between molecule atoms
-                if atom_i >= surface_count or atom_j >= surface_count:
-                    if atom_i >= surface_count and atom_j >= surface_count:
-                        pos_i = positions[atom_i]
-                        pos_j = positions[atom_j]
-
-                        self.ax.plot(
-                            [pos_i[0], pos_j[0]],
-                            [pos_i[1], pos_j[1]],
-                            [pos_i[2], pos_j[2]],
-                            'k-',
-                            linewidth=0.5,
-                            alpha=0.5
-                        )
+            molecule_part = combined[surface_count:]
+            i_arr, j_arr = neighbor_list('ij', molecule_part,
+                                         cutoff=bond_cutoffs(molecule_part.numbers))
+            pairs = i_arr < j_arr  # Each bond once
+            segments = np.stack([molecule_pos[i_arr[pairs]], molecule_pos[j_arr[pairs]]], axis=1)
         except Exception as e:
             pass  # Bonds not critical for visualization
 
-        # Labels and title
-        self.ax.set_xlabel('X (Å)')
-        self.ax.set_ylabel('Y (Å)')
-        self.ax.set_zlabel('Z (Å)')
-        self.ax.set_title(title, fontsize=12, fontweight='bold')
-
-        # Set aspect ratio
-        x_range = positions[:, 0].max() - positions[:, 0].min()
-        y_range = positions[:, 1].max() - positions[:, 1].min()
-        z_range = positions[:, 2].max() - positions[:, 2].min()
-
-        max_range = max(x_range, y_range, z_range)
-
-        center_x = positions[:, 0].mean()
-        center_y = positions[:, 1].mean()
-        center_z = positions[:, 2].mean()
-
-        margin = max_range * 0.1
-        self.ax.set_xlim(center_x - max_range/2 - margin, center_x + max_range/2 + margin)
-        self.ax.set_ylim(center_y - max_range/2 - margin, center_y + max_range/2 + margin)
-        self.ax.set_zlim(center_z - max_range/2 - margin, center_z + max_range/2 + margin)
-
-        self.ax.view_init(elev=20, azim=45)
+        bonds = self._artists.get("bonds")
+        if bonds is None:
+            bonds = Line3DCollection(segments, colors='k', linewidths=0.5, alpha=0.5)
+            self.ax.add_collection3d(bonds)
+            self._artists["bonds"] = bonds
+        else:
+            bonds.set_segments(segments)
 
-        self.fig.tight_layout()
-        self.canvas.draw()
+        self._finish_view(positions, title)
 
     def rotate_view(self, azim: int = 0, elev: int = 0):
         """Rotate view"""
-        if self.current_structure is not None:
-            self.ax.view_init(elev=elev, azim=azim)
-            self.canvas.draw()
+        self.ax.view_init(elev=elev, azim=azim)
+        self.canvas.draw_idle()
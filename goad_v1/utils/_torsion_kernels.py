@@ -0,0 +1,143 @@
+"""
+Torsion rotation kernels for GOAD v1.0
+
+Compiled with Numba when it is installed, plain NumPy otherwise
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _rodrigues_numpy(axis, angle, out):
+    """NumPy version of rodrigues"""
+    cos_a = np.cos(angle)
+    sin_a = np.sin(angle)
+    # R = cos(θ) I + sin(θ) K + (1 - cos(θ)) a aᵀ
+    np.multiply.outer(axis, axis, out=out)
+    out *= 1.0 - cos_a
+    out[0, 0] += cos_a
+    out[1, 1] += cos_a
+    out[2, 2] += cos_a
+    out[0, 1] -= sin_a * axis[2]
+    out[0, 2] += sin_a * axis[1]
+    out[1, 0] += sin_a * axis[2]
+    out[1, 2] -= sin_a * axis[0]
+    out[2, 0] -= sin_a * axis[1]
+    out[2, 1] += sin_a * axis[0]
+
+
+def _rotate_indices_numpy(positions, idx, R, origin):
+    """NumPy version of rotate_indices"""
+    positions[idx] = (positions[idx] - origin) @ R.T + origin
+
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _rodrigues_numba(axis, angle, out):
+        """Numba version of rodrigues"""
+        x, y, z = axis[0], axis[1], axis[2]
+        cos_a = np.cos(angle)
+        sin_a = np.sin(angle)
+        c1 = 1.0 - cos_a
+
+        out[0, 0] = cos_a + c1 * x * x
+        out[0, 1] = c1 * x * y - sin_a * z
+        out[0, 2] = c1 * x * z + sin_a * y
+        out[1, 0] = c1 * y * x + sin_a * z
+        out[1, 1] = cos_a + c1 * y * y
+        out[1, 2] = c1 * y * z - sin_a * x
+        out[2, 0] = c1 * z * x - sin_a * y
+        out[2, 1] = c1 * z * y + sin_a * x
+        out[2, 2] = cos_a + c1 * z * z
+
+    @njit(cache=True, fastmath=True)
+    def _rotate_indices_numba(positions, idx, R, origin):
+        """Numba version of rotate_indices"""
+        ox, oy, oz = origin[0], origin[1], origin[2]
+        for k in range(idx.shape[0]):
+            i = idx[k]
+            x = positions[i, 0] - ox
+            y = positions[i, 1] - oy
+            z = positions[i, 2] - oz
+            positions[i, 0] = R[0, 0] * x + R[0, 1] * y + R[0, 2] * z + ox
+            positions[i, 1] = R[1, 0] * x + R[1, 1] * y + R[1, 2] * z + oy
+            positions[i, 2] = R[2, 0] * x + R[2, 1] * y + R[2, 2] * z + oz
+
+
+def rodrigues(axis: np.ndarray, angle: float, out: np.ndarray) -> None:
+    """
+    Rotation matrix about a unit axis (Rodrigues' formula), written into out.
+
+    Args:
+        axis: Unit rotation axis
+        angle: Rotation angle in radians
+        out: (3, 3) float64 output buffer
+    """
+    if HAS_NUMBA:
+        _rodrigues_numba(axis, angle, out)
+    else:
+        _rodrigues_numpy(axis, angle, out)
+
+
+def rotate_indices(positions: np.ndarray, idx: np.ndarray, R: np.ndarray,
+                   origin: np.ndarray) -> None:
+    """
+    Rotate selected positions about origin in place.
+
+    Computes positions[idx] = (positions[idx] - origin) @ R.T + origin.
+
+    Args:
+        positions: (N, 3) float64 positions, modified in place
+        idx: Indices of the rotated atoms
+        R: (3, 3) rotation matrix
+        origin: Point on the rotation axis
+    """
+    if HAS_NUMBA:
+        _rotate_indices_numba(positions, idx, R, origin)
+    else:
+        _rotate_indices_numpy(positions, idx, R, origin)
+
+
+def rodrigues_batch(axes: np.ndarray, angles: np.ndarray, out: np.ndarray) -> None:
+    """
+    Rotation matrices about several unit axes, written into out.
+
+    Element-wise NumPy expressions over the whole batch, so there is no
+    Numba version.
+
+    Args:
+        axes: (P, 3) unit rotation axes
+        angles: (P,) rotation angles in radians
+        out: (P, 3, 3) float64 output buffer
+    """
+    cos_a = np.cos(angles)
+    sin_a = np.sin(angles)
+    x, y, z = axes[:, 0], axes[:, 1], axes[:, 2]
+
+    # R = cos(θ) I + sin(θ) K + (1 - cos(θ)) a aᵀ
+    np.multiply(axes[:, :, None], axes[:, None, :], out=out)
+    out *= (1.0 - cos_a)[:, None, None]
+    out[:, 0, 0] += cos_a
+    out[:, 1, 1] += cos_a
+    out[:, 2, 2] += cos_a
+    out[:, 0, 1] -= sin_a * z
+    out[:, 0, 2] += sin_a * y
+    out[:, 1, 0] += sin_a * z
+    out[:, 1, 2] -= sin_a * x
+    out[:, 2, 0] -= sin_a * y
+    out[:, 2, 1] += sin_a * x
+
+
+def warm_up():
+    """Compile (or load from the Numba cache) the kernels on tiny inputs"""
+    if not HAS_NUMBA:
+        return
+
+    R = np.empty((3, 3))
+    rodrigues(np.array([0.0, 0.0, 1.0]), 0.0, R)
+    rotate_indices(np.zeros((1, 3)), np.zeros(1, dtype=np.intp), R, np.zeros(3))
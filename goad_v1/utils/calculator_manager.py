@@ -4,31 +4,133 @@ Calculator management for GOAD v1.0
 Handles different MatterSim calculator configurations
 """
 
+import functools
 import logging
-from typing import Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ase import Atoms
 
 logger = logging.getLogger(__name__)
 
+# Loaded calculators keyed by (calculator type, device, precision)
+_calculators: Dict[Tuple[str, Optional[str], str], object] = {}
+_calculators_lock = threading.Lock()
+
+# One loader thread, so concurrent async requests load one model at a time
+_loader: Optional[ThreadPoolExecutor] = None
+
+
+@functools.lru_cache(maxsize=None)
+def _import_mattersim():
+    """
+    Import MatterSimCalculator once.
+
+    Returns:
+        Tuple of (MatterSimCalculator class, None), or (None, ImportError)
+        when MatterSim is not installed, so a failed import is not retried
+    """
+    try:
+        from mattersim.forcefield import MatterSimCalculator
+    except ImportError as e:
+        return None, e
+    return MatterSimCalculator, None
+
+
+def _mattersim_calculator_class():
+    """MatterSimCalculator class (raises the ImportError if unavailable)"""
+    calculator_class, error = _import_mattersim()
+    if error is not None:
+        raise ImportError(f"MatterSim is not available: {error}") from error
+    return calculator_class
+
 
 class CalculatorManager:
     """Manage different ASE calculator configurations"""
 
     @staticmethod
-    def get_mattersim_1m():
+    def _device_kwargs(device: Optional[str]) -> dict:
+        """
+        MatterSimCalculator keyword arguments for a device.
+
+        Args:
+            device: "cpu", "cuda", or None for MatterSim's default
+                (CUDA when available)
+
+        Returns:
+            Dictionary with the device keyword (empty for the default)
+        """
+        if device is None:
+            return {}
+
+        device = device.lower().strip()
+        if device == "cuda":
+            import torch
+            if not torch.cuda.is_available():
+                logger.warning("CUDA requested but not available, using CPU")
+                device = "cpu"
+            else:
+                # Fixed-size inputs dominate, so let cuDNN pick the fastest kernels
+                torch.backends.cudnn.benchmark = True
+
+        return {"device": device}
+
+    @staticmethod
+    def _enable_autocast(calc, precision: str):
+        """
+        Run the calculator's model forward pass under torch.autocast.
+
+        Outputs are cast back to float32, so the calculator still hands
+        ordinary floating point arrays to ASE.
+
+        Args:
+            calc: MatterSim calculator
+            precision: "bf16" or "fp16"
+        """
+        import torch
+
+        dtype = {"bf16": torch.bfloat16, "fp16": torch.float16}[precision]
+        model = calc.potential.model
+        forward = model.forward
+
+        def as_float32(output):
+            if isinstance(output, torch.Tensor):
+                return output.float() if output.is_floating_point() else output
+            if isinstance(output, dict):
+                return {key: as_float32(value) for key, value in output.items()}
+            if isinstance(output, (tuple, list)):
+                return type(output)(as_float32(value) for value in output)
+            return output
+
+        def autocast_forward(*args, **kwargs):
+            device_type = next(model.parameters()).device.type
+            with torch.autocast(device_type=device_type, dtype=dtype):
+                output = forward(*args, **kwargs)
+            return as_float32(output)
+
+        model.forward = autocast_forward
+        logger.info(f"MatterSim inference running in {precision.upper()} autocast")
+
+    @staticmethod
+    def get_mattersim_1m(device: Optional[str] = None):
         """
         Get MatterSim 1M calculator (fastest, lower accuracy)
 
+        Args:
+            device: "cpu", "cuda", or None for MatterSim's default
+
         Returns:
             MatterSim calculator object
         """
         try:
-            from mattersim.forcefield import MatterSimCalculator
+            MatterSimCalculator = _mattersim_calculator_class()
 
             logger.info("Loading MatterSim 1M calculator...")
             # MatterSimCalculator loads the default 1M model by default
             # Note: MatterSim may perform internal structure relaxation
             # Use get_potential_energy() for single-point calculations only
-            calc = MatterSimCalculator()
+            calc = MatterSimCalculator(**CalculatorManager._device_kwargs(device))
             logger.info("✓ MatterSim 1M loaded successfully")
             return calc
 
@@ -37,74 +139,220 @@ class CalculatorManager:
             raise
 
     @staticmethod
-    def get_mattersim_5m():
+    def get_mattersim_5m(device: Optional[str] = None):
         """
         Get MatterSim 5M calculator (balanced speed/accuracy)
 
+        Args:
+            device: "cpu", "cuda", or None for MatterSim's default
+
         Returns:
             MatterSim calculator object
         """
         try:
-            from mattersim.forcefield import MatterSimCalculator
+            MatterSimCalculator = _mattersim_calculator_class()
 
             logger.info("Loading MatterSim 5M calculator...")
             # Try to load 5M model - may not be available in all installations
-            calc = MatterSimCalculator(model_name="mattersim-v1.0.0-5M")
+            calc = MatterSimCalculator(model_name="mattersim-v1.0.0-5M",
+                                       **CalculatorManager._device_kwargs(device))
             logger.info("✓ MatterSim 5M loaded successfully")
             return calc
 
         except Exception as e:
             logger.warning(f"MatterSim 5M not available, falling back to 1M: {e}")
             # Fall back to 1M
-            return CalculatorManager.get_mattersim_1m()
+            return CalculatorManager.get_mattersim_1m(device)
 
     @staticmethod
-    def get_mattersim_5m_d3():
+    def get_mattersim_5m_d3(device: Optional[str] = None):
         """
         Get MatterSim 5M calculator with D3 dispersion correction (highest accuracy)
 
+        Args:
+            device: "cpu", "cuda", or None for MatterSim's default
+
         Returns:
             MatterSim calculator object
         """
         try:
-            from mattersim.forcefield import MatterSimCalculator
+            MatterSimCalculator = _mattersim_calculator_class()
 
             logger.info("Loading MatterSim 5M + D3 calculator...")
             # Try to load 5M with D3
-            calc = MatterSimCalculator(model_name="mattersim-v1.0.0-5M", use_d3=True)
+            calc = MatterSimCalculator(model_name="mattersim-v1.0.0-5M", use_d3=True,
+                                       **CalculatorManager._device_kwargs(device))
             logger.info("✓ MatterSim 5M + D3 loaded successfully")
             return calc
 
         except Exception as e:
             logger.warning(f"MatterSim 5M+D3 not available, falling back to 1M: {e}")
             # Fall back to 1M
-            return CalculatorManager.get_mattersim_1m()
+            return CalculatorManager.get_mattersim_1m(device)
 
     @staticmethod
-    def get_calculator(calculator_type: str = "1m"):
+    def get_calculator(calculator_type: str = "1m", device: Optional[str] = None,
+                       precision: str = "fp32"):
         """
         Get calculator by type string.
 
+        Calculators are loaded once per (type, device, precision) and shared
+        by all later calls, so the model stays resident on the chosen device.
+
         Args:
-            calculator_type: Type of calculator ("1m", "5m", "5m_d3")
+            calculator_type: Type of calculator ("1m", "5m", "5m_d3"),
+                optionally with a precision suffix (e.g. "5m:bf16") that
+                overrides precision and a device suffix (e.g. "5m:bf16@cpu")
+                that overrides device
+            device: "cpu", "cuda", or None for MatterSim's default
+            precision: Inference precision, "fp32" or reduced-precision
+                autocast with "bf16" / "fp16"
 
         Returns:
             Calculator object
 
         Raises:
-            ValueError: If invalid calculator type
+            ValueError: If invalid calculator type or precision
         """
         calculator_type = calculator_type.lower().strip()
+        if "@" in calculator_type:
+            calculator_type, device = calculator_type.rsplit("@", 1)
+        if ":" in calculator_type:
+            calculator_type, precision = calculator_type.split(":", 1)
+        if calculator_type == "5m+d3":
+            calculator_type = "5m_d3"
+        if device is not None:
+            device = device.lower().strip()
 
-        if calculator_type == "1m":
-            return CalculatorManager.get_mattersim_1m()
-        elif calculator_type == "5m":
-            return CalculatorManager.get_mattersim_5m()
-        elif calculator_type == "5m_d3" or calculator_type == "5m+d3":
-            return CalculatorManager.get_mattersim_5m_d3()
-        else:
+        loaders = {
+            "1m": CalculatorManager.get_mattersim_1m,
+            "5m": CalculatorManager.get_mattersim_5m,
+            "5m_d3": CalculatorManager.get_mattersim_5m_d3,
+        }
+        if calculator_type not in loaders:
             raise ValueError(f"Unknown calculator type: {calculator_type}")
 
+        precision = precision.lower().strip()
+        if precision not in ("fp32", "bf16", "fp16"):
+            raise ValueError(f"Unknown precision: {precision}")
+
+        key = (calculator_type, device, precision)
+        with _calculators_lock:
+            calc = _calculators.get(key)
+            if calc is None:
+                calc = loaders[calculator_type](device)
+                if precision != "fp32":
+                    CalculatorManager._enable_autocast(calc, precision)
+                _calculators[key] = calc
+            else:
+                logger.info(f"Reusing loaded {calculator_type.upper()} calculator")
+
+        return calc
+
+    @staticmethod
+    def get_calculator_async(root, calculator_type: str, on_done: Callable,
+                             on_error: Optional[Callable] = None,
+                             device: Optional[str] = None, precision: str = "fp32",
+                             poll_ms: int = 100) -> Future:
+        """
+        Load a calculator in a background thread without blocking Tk.
+
+        get_calculator runs in a worker thread; the Tk thread polls the
+        future with root.after and calls the callbacks there, so they may
+        use Tk and matplotlib.
+
+        Args:
+            root: Tk widget whose after() schedules the polling
+            calculator_type: Type of calculator, as for get_calculator
+            on_done: Called with the loaded calculator (Tk thread)
+            on_error: Called with the loading exception (Tk thread); if None
+                the exception is logged
+            device: "cpu", "cuda", or None for MatterSim's default
+            precision: Inference precision, as for get_calculator
+            poll_ms: Polling interval in milliseconds
+
+        Returns:
+            Future of the calculator
+        """
+        global _loader
+        if _loader is None:
+            _loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="calculator-loader")
+
+        future = _loader.submit(CalculatorManager.get_calculator, calculator_type,
+                                device=device, precision=precision)
+
+        def poll():
+            if not future.done():
+                root.after(poll_ms, poll)
+                return
+
+            error = future.exception()
+            if error is None:
+                on_done(future.result())
+            elif on_error is not None:
+                on_error(error)
+            else:
+                logger.error(f"Could not load calculator {calculator_type}: {error}")
+
+        root.after(poll_ms, poll)
+        return future
+
+    @staticmethod
+    def batch_evaluate(calculator, atoms_list: List[Atoms], batch_size: int = 16) -> List[float]:
+        """
+        Total energies of several structures with batched MatterSim inference.
+
+        The structures are collated into graph batches of batch_size and
+        run through the calculator's potential, one forward pass per batch.
+
+        Args:
+            calculator: MatterSim calculator (from get_calculator)
+            atoms_list: Structures to evaluate
+            batch_size: Structures per forward pass
+
+        Returns:
+            Total energy (eV) of each structure, in order
+        """
+        from mattersim.datasets.utils.build import build_dataloader
+
+        potential = calculator.potential
+        model_args = getattr(potential.model, "model_args", {})
+
+        dataloader = build_dataloader(
+            atoms_list,
+            model_type=getattr(potential, "model_name", "m3gnet"),
+            cutoff=model_args.get("cutoff", 5.0),
+            threebody_cutoff=model_args.get("threebody_cutoff", 4.0),
+            batch_size=batch_size,
+            only_inference=True,
+        )
+        energies, _, _ = potential.predict_properties(
+            dataloader, include_forces=False, include_stresses=False)
+
+        return [float(energy) for energy in energies]
+
+    @staticmethod
+    def supports_batch_evaluate(calculator_type: str) -> bool:
+        """
+        Whether batch_evaluate gives the same energies as the calculator.
+
+        batch_evaluate only runs the potential, so calculators that add a
+        dispersion correction on top of it (5m_d3) must be evaluated one
+        structure at a time.
+
+        Args:
+            calculator_type: Type of calculator, as for get_calculator
+
+        Returns:
+            True if batched energies match the calculator's
+        """
+        calculator_type = calculator_type.lower().strip()
+        calculator_type = calculator_type.split("@", 1)[0].split(":", 1)[0]
+        if calculator_type == "5m+d3":
+            calculator_type = "5m_d3"
+        info = CalculatorManager.get_calculator_info(calculator_type)
+        return info.get("dispersion") == "No"
+
     @staticmethod
     def get_calculator_info(calculator_type: str) -> dict:
         """
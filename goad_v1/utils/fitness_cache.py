@@ -0,0 +1,159 @@
+"""
+Fitness caching for GOAD v1.0
+
+Memoizes GA fitness values of (nearly) identical genomes
+"""
+
+import logging
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Hashable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def genome_key(genome: np.ndarray, decimals: int = 2) -> tuple:
+    """
+    Hashable cache key for a genome row.
+
+    Args:
+        genome: Genome row with position, orientation and torsions
+        decimals: Genes are rounded to this many decimals, so genomes
+            closer than that share a key
+
+    Returns:
+        Tuple of rounded genes
+    """
+    return tuple(np.round(genome, decimals=decimals).tolist())
+
+
+class LRUCache:
+    """Least-recently-used cache with hit/miss counters"""
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Initialize cache.
+
+        Args:
+            maxsize: Maximum number of stored entries
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[float]:
+        """Cached value for key, or None on a miss"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: float):
+        """Store a value, evicting the least recently used entry if full"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def flush(self):
+        """Write pending entries to persistent storage (nothing to do in memory)"""
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+
+class SQLiteFitnessCache(LRUCache):
+    """
+    LRU cache backed by a SQLite file, so fitness values survive across runs.
+
+    Entries live in one table shared by all runs; the namespace (e.g. a hash
+    of calculator type, structures and reference energies) keeps values of
+    different setups apart. New entries are written in one transaction per
+    flush().
+    """
+
+    def __init__(self, path: Path, namespace: str, maxsize: int = 4096):
+        """
+        Initialize cache.
+
+        Args:
+            path: SQLite database file (created if missing)
+            namespace: Identifier of the setup the stored values belong to
+            maxsize: Maximum number of entries kept in memory
+        """
+        super().__init__(maxsize)
+        self.path = Path(path)
+        self.namespace = namespace
+        self._pending: List[Tuple[str, float]] = []
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # The GA runs in a worker thread, not in the thread creating the cache
+        self._conn = sqlite3.connect(str(self.path), isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fitness (key TEXT PRIMARY KEY, energy REAL)")
+
+    def _db_key(self, key: Hashable) -> str:
+        """Database key of a cache key"""
+        return f"{self.namespace}|{key!r}"
+
+    def get(self, key: Hashable) -> Optional[float]:
+        """Cached value for key (memory first, then disk), or None on a miss"""
+        value = super().get(key)
+        if value is not None:
+            return value
+
+        row = self._conn.execute("SELECT energy FROM fitness WHERE key=?",
+                                 (self._db_key(key),)).fetchone()
+        if row is None:
+            return None
+
+        # Counted as a miss by the in-memory lookup above
+        self.misses -= 1
+        self.hits += 1
+        LRUCache.put(self, key, row[0])
+        return row[0]
+
+    def put(self, key: Hashable, value: float):
+        """Store a value; it is written to disk on the next flush()"""
+        super().put(key, value)
+        self._pending.append((self._db_key(key), float(value)))
+
+    def flush(self):
+        """Write all pending entries in one transaction"""
+        if not self._pending:
+            return
+
+        try:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO fitness (key, energy) VALUES (?, ?)",
+                    self._pending)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write fitness cache {self.path}: {e}")
+        self._pending.clear()
+
+    def close(self):
+        """Flush pending entries and close the database"""
+        self.flush()
+        self._conn.close()
+
+    def __contains__(self, key: Hashable) -> bool:
+        if super().__contains__(key):
+            return True
+        return self._conn.execute("SELECT 1 FROM fitness WHERE key=?",
+                                  (self._db_key(key),)).fetchone() is not None
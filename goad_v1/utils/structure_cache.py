@@ -0,0 +1,118 @@
+"""
+Structure caching for GOAD v1.0
+
+Content hashes of structures and an on-disk cache of relaxed references
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+from ase import Atoms
+from ase.io import read, write
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "goad_v1"
+
+
+def structure_hash(atoms: Atoms) -> str:
+    """
+    SHA-256 hex digest of positions, chemical symbols and cell.
+
+    Args:
+        atoms: Structure to hash
+
+    Returns:
+        Hex digest identifying the structure content
+    """
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(atoms.get_positions(), dtype=np.float64).tobytes())
+    digest.update(repr(atoms.get_chemical_symbols()).encode())
+    digest.update(np.ascontiguousarray(atoms.cell.array, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+class RelaxationCache:
+    """Relaxed structures and energies stored as .traj + .json pairs"""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory for cached files (default ~/.cache/goad_v1)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+
+    def _key(self, atoms: Atoms, calc_type: str, n_fixed_layers: int, fmax: float,
+             optimizer: str) -> str:
+        """Cache key of a relaxation setup"""
+        spec = f"{structure_hash(atoms)}|{calc_type}|{n_fixed_layers}|{fmax}|{optimizer}"
+        return hashlib.sha256(spec.encode()).hexdigest()
+
+    def get(self, atoms: Atoms, calc_type: str, n_fixed_layers: int,
+            fmax: float, optimizer: str) -> Optional[Tuple[Atoms, float]]:
+        """
+        Look up a previous relaxation of the same input structure.
+
+        Args:
+            atoms: Unrelaxed input structure
+            calc_type: Calculator type used for the relaxation
+            n_fixed_layers: Number of fixed layers (0 for molecules)
+            fmax: Force convergence criterion (eV/Å)
+            optimizer: Name of the ase.optimize class used for the relaxation
+
+        Returns:
+            (relaxed structure, energy), or None if not cached
+        """
+        key = self._key(atoms, calc_type, n_fixed_layers, fmax, optimizer)
+        json_file = self.cache_dir / f"{key}.json"
+        traj_file = self.cache_dir / f"{key}.traj"
+        if not json_file.exists() or not traj_file.exists():
+            return None
+
+        try:
+            with open(json_file) as f:
+                energy = json.load(f)["energy"]
+            relaxed = read(traj_file)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable relaxation cache entry {key}: {e}")
+            return None
+
+        return relaxed, energy
+
+    def put(self, atoms: Atoms, calc_type: str, n_fixed_layers: int, fmax: float,
+            optimizer: str, relaxed: Atoms, energy: float):
+        """
+        Store a relaxation result.
+
+        Args:
+            atoms: Unrelaxed input structure (used for the key)
+            calc_type: Calculator type used for the relaxation
+            n_fixed_layers: Number of fixed layers (0 for molecules)
+            fmax: Force convergence criterion (eV/Å)
+            optimizer: Name of the ase.optimize class used for the relaxation
+            relaxed: Relaxed structure
+            energy: Energy of the relaxed structure (eV)
+        """
+        key = self._key(atoms, calc_type, n_fixed_layers, fmax, optimizer)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            write(self.cache_dir / f"{key}.traj", relaxed)
+
+            # The JSON file is written last and marks a complete entry
+            with open(self.cache_dir / f"{key}.json", "w") as f:
+                json.dump({
+                    "energy": float(energy),
+                    "calc_type": calc_type,
+                    "n_fixed_layers": n_fixed_layers,
+                    "fmax": fmax,
+                    "optimizer": optimizer,
+                    "formula": relaxed.get_chemical_formula(),
+                }, f, indent=2)
+        except Exception as e:
+            logger.warning(f"Could not write relaxation cache entry {key}: {e}")
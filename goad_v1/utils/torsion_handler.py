@@ -4,14 +4,74 @@ Torsion handling for molecular optimization in GOAD v1.0
 Detects rotatable bonds and applies torsion angles to molecules
 """
 
+import math
+
 import numpy as np
 from ase import Atoms
+from ase.neighborlist import neighbor_list
+from collections import defaultdict, deque
+from itertools import combinations_with_replacement
 from typing import List, Tuple, Dict, Optional
 import logging
 
+from ._torsion_kernels import rodrigues, rodrigues_batch, rotate_indices
+
+try:
+    from rdkit import Chem
+    from rdkit.Chem import rdDetermineBonds
+    HAS_RDKIT = True
+except ImportError:
+    HAS_RDKIT = False
+
 logger = logging.getLogger(__name__)
 
 
+def bond_cutoffs(numbers: np.ndarray, cutoff: float = 1.6) -> Dict[Tuple[int, int], float]:
+    """
+    Per element pair bond cutoffs for ase.neighborlist.neighbor_list.
+
+    Every pair of the elements present gets the same cutoff, except H-H:
+    hydrogens on one heavy atom (e.g. in H2O or NH2) can be closer than
+    1.6 Å without being bonded.
+
+    Args:
+        numbers: Atomic numbers of the structure
+        cutoff: Bond cutoff (Angstrom)
+
+    Returns:
+        Dictionary mapping (Z1, Z2) to the cutoff
+    """
+    elements = np.unique(numbers).tolist()
+    return {(a, b): cutoff for a, b in combinations_with_replacement(elements, 2)
+            if not (a == 1 and b == 1)}
+
+
+def _subtree(adjacency: Dict[int, List[int]], bond_begin: int, bond_end: int) -> np.ndarray:
+    """
+    Atoms on the bond_end side of a bond (breadth-first search).
+
+    Args:
+        adjacency: Bonded neighbors of every atom
+        bond_begin: Index of first atom in bond (not crossed)
+        bond_end: Index of second atom in bond (not included)
+
+    Returns:
+        intp array of the atom indices
+    """
+    neighbors = [nb for nb in adjacency[bond_end] if nb != bond_begin]
+    subtree = set(neighbors)
+    to_check = deque(neighbors)
+
+    while to_check:
+        current = to_check.popleft()
+        for nb in adjacency[current]:
+            if nb != bond_begin and nb != bond_end and nb not in subtree:
+                subtree.add(nb)
+                to_check.append(nb)
+
+    return np.fromiter(subtree, dtype=np.intp, count=len(subtree))
+
+
 class TorsionHandler:
     """Detect and manipulate molecular torsions"""
 
@@ -27,86 +87,107 @@ class TorsionHandler:
         self.torsion_angles = []
         self.n_torsions = 0
 
+        # Rotation matrix and bond axis buffers reused by every torsion
+        self._rotation_buffer = np.empty((3, 3))
+        self._axis = np.empty(3)
+
         # Detect torsions using RDKit if available
         self._detect_torsions_rdkit()
 
+        # Atoms moved by each torsion. Only the angles change during the
+        # search, not the bonding, so these are found once per molecule.
+        self.rotation_subsets = self._rotation_subsets(self.molecule) if self.n_torsions else []
+
     def _detect_torsions_rdkit(self):
         """
         Detect rotatable bonds using RDKit.
 
         Identifies bonds that can rotate (not in rings, not triple bonds)
         """
+        if not HAS_RDKIT:
+            logger.warning("RDKit not available, torsion detection disabled")
+            self.rotatable_bonds = []
+            self.n_torsions = 0
+            return
+
         try:
-            from rdkit import Chem
-            from rdkit.Chem import Descriptors, Lipinski
-            from ase.io import write
-            import tempfile
-            import os
+            mol = self._to_rdkit_mol()
+            if mol is None:
+                logger.warning("Could not parse molecule with RDKit")
+                return
+
+            # Find rotatable bonds
+            rotatable_bonds = []
 
-            # Convert ASE Atoms to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.sdf', delete=False) as tmp:
-                tmp_file = tmp.name
+            for bond in mol.GetBonds():
+                # Skip if bond is in ring
+                if bond.IsInRing():
+                    continue
 
-            try:
-                write(tmp_file, self.molecule)
+                # Skip double/triple bonds
+                if bond.GetBondType() != Chem.BondType.SINGLE:
+                    continue
 
-                # Load with RDKit
-                mol = Chem.SDMolFromFile(tmp_file)
-                if mol is None:
-                    logger.warning("Could not parse molecule with RDKit")
-                    return
+                begin_atom = bond.GetBeginAtomIdx()
+                end_atom = bond.GetEndAtomIdx()
 
-                # Find rotatable bonds
-                rotatable_bonds = []
+                # Skip bonds to hydrogen
+                begin_atom_obj = mol.GetAtomWithIdx(begin_atom)
+                end_atom_obj = mol.GetAtomWithIdx(end_atom)
 
-                for bond in mol.GetBonds():
-                    # Skip if bond is in ring
-                    if bond.IsInRing():
-                        continue
+                if begin_atom_obj.GetAtomicNum() == 1 or end_atom_obj.GetAtomicNum() == 1:
+                    continue
 
-                    # Skip double/triple bonds
-                    if bond.GetBondType() != Chem.BondType.SINGLE:
-                        continue
+                # Skip if either atom has only 1 neighbor
+                if len(begin_atom_obj.GetNeighbors()) < 2 or len(end_atom_obj.GetNeighbors()) < 2:
+                    continue
 
-                    begin_atom = bond.GetBeginAtomIdx()
-                    end_atom = bond.GetEndAtomIdx()
+                rotatable_bonds.append((begin_atom, end_atom))
 
-                    # Skip bonds to hydrogen
-                    begin_atom_obj = mol.GetAtomWithIdx(begin_atom)
-                    end_atom_obj = mol.GetAtomWithIdx(end_atom)
+            self.rotatable_bonds = rotatable_bonds
+            self.n_torsions = len(rotatable_bonds)
 
-                    if begin_atom_obj.GetAtomicNum() == 1 or end_atom_obj.GetAtomicNum() == 1:
-                        continue
+            logger.info(f"Detected {self.n_torsions} rotatable bonds:")
+            for i, (b, e) in enumerate(rotatable_bonds):
+                logger.info(f"  Torsion {i}: atoms {b}-{e}")
 
-                    # Skip if either atom has only 1 neighbor
-                    if len(begin_atom_obj.GetNeighbors()) < 2 or len(end_atom_obj.GetNeighbors()) < 2:
-                        continue
+            # Initialize torsion angles (0 degrees)
+            self.torsion_angles = [0.0] * self.n_torsions
 
-                    rotatable_bonds.append((begin_atom, end_atom))
+        except Exception as e:
+            logger.warning(f"Error detecting torsions: {e}")
+            self.rotatable_bonds = []
+            self.n_torsions = 0
 
-                self.rotatable_bonds = rotatable_bonds
-                self.n_torsions = len(rotatable_bonds)
+    def _to_rdkit_mol(self):
+        """
+        RDKit molecule with bonds perceived from the 3D coordinates.
 
-                logger.info(f"Detected {self.n_torsions} rotatable bonds:")
-                for i, (b, e) in enumerate(rotatable_bonds):
-                    logger.info(f"  Torsion {i}: atoms {b}-{e}")
+        Converted in memory through an XYZ block; atom indices match the
+        ASE molecule.
 
-                # Initialize torsion angles (0 degrees)
-                self.torsion_angles = [0.0] * self.n_torsions
+        Returns:
+            RDKit Mol, or None if RDKit cannot parse the structure
+        """
+        lines = [str(len(self.molecule)), ""]
+        for symbol, (x, y, z) in zip(self.molecule.get_chemical_symbols(),
+                                     self.molecule.get_positions()):
+            lines.append(f"{symbol} {x:.6f} {y:.6f} {z:.6f}")
 
-            finally:
-                # Clean up temp file
-                if os.path.exists(tmp_file):
-                    os.remove(tmp_file)
+        mol = Chem.MolFromXYZBlock("\n".join(lines) + "\n")
+        if mol is None:
+            return None
 
-        except ImportError:
-            logger.warning("RDKit not available, torsion detection disabled")
-            self.rotatable_bonds = []
-            self.n_torsions = 0
+        try:
+            # Connectivity and bond orders (needed to skip double/triple bonds)
+            rdDetermineBonds.DetermineBonds(mol, charge=0)
         except Exception as e:
-            logger.warning(f"Error detecting torsions: {e}")
-            self.rotatable_bonds = []
-            self.n_torsions = 0
+            # E.g. radicals or charged species: connectivity only, all bonds single
+            logger.warning(f"Could not assign bond orders, using connectivity only: {e}")
+            mol = Chem.MolFromXYZBlock("\n".join(lines) + "\n")
+            rdDetermineBonds.DetermineConnectivity(mol)
+
+        return mol
 
     def apply_torsions(self, molecule_copy: Atoms, torsion_angles: List[float]) -> Atoms:
         """
@@ -126,18 +207,101 @@ class TorsionHandler:
         if self.n_torsions == 0:
             return molecule_copy
 
-        # Apply each torsion
+        # Apply each torsion to one positions array, written back once
+        positions = molecule_copy.get_positions()
         for i, (torsion_angle, (bond_begin, bond_end)) in enumerate(
             zip(torsion_angles, self.rotatable_bonds)
         ):
-            molecule_copy = self._apply_single_torsion(
-                molecule_copy, bond_begin, bond_end, torsion_angle
-            )
+            self._rotate_torsion(positions, self.rotation_subsets[i],
+                                 bond_begin, bond_end, torsion_angle)
 
+        molecule_copy.set_positions(positions)
         return molecule_copy
 
+    def apply_torsions_batch(self, base_positions: np.ndarray,
+                             angles_matrix: np.ndarray) -> np.ndarray:
+        """
+        Apply one vector of torsion angles per individual to the same molecule.
+
+        Each torsion is applied to all individuals at once: one rotation
+        matrix per individual, multiplied onto the subset of atoms the bond
+        moves.
+
+        Args:
+            base_positions: (N, 3) molecule positions before the torsions
+            angles_matrix: (P, n_torsions) torsion angles in degrees
+
+        Returns:
+            (P, N, 3) positions with the torsions applied
+        """
+        angles_matrix = np.asarray(angles_matrix, dtype=np.float64)
+        n_individuals = angles_matrix.shape[0]
+        positions = np.repeat(np.asarray(base_positions, dtype=np.float64)[None],
+                              n_individuals, axis=0)
+        if self.n_torsions == 0:
+            return positions
+
+        # Buffers shared by all torsions of the batch
+        R = np.empty((n_individuals, 3, 3))
+        axes = np.empty((n_individuals, 3))
+        lengths = np.empty((n_individuals, 1))
+        origin = np.empty((n_individuals, 1, 3))
+
+        angles_rad = np.deg2rad(angles_matrix)
+        for i, (bond_begin, bond_end) in enumerate(self.rotatable_bonds):
+            idx = self.rotation_subsets[i]
+
+            np.subtract(positions[:, bond_end], positions[:, bond_begin], out=axes)
+            np.sqrt(np.einsum('pi,pi->p', axes, axes), out=lengths[:, 0])
+            axes /= lengths
+            rodrigues_batch(axes, angles_rad[:, i], R)
+
+            # Rotate the selected atoms of every individual about its bond_end
+            origin[:, 0] = positions[:, bond_end]
+            moved = positions[:, idx]
+            moved -= origin
+            positions[:, idx] = np.einsum('pij,pkj->pki', R, moved) + origin
+
+        return positions
+
+    def _adjacency(self, atoms: Atoms) -> Dict[int, List[int]]:
+        """
+        Bonded neighbors (1.6 Å cutoff, no H-H bonds) of every atom.
+
+        Errors of the neighbor list build are not caught: skipping the
+        torsions would hand the GA a structure that does not match its genes.
+
+        Args:
+            atoms: Molecule
+
+        Returns:
+            Mapping of atom index to neighbor indices
+        """
+        i, j = neighbor_list('ij', atoms, cutoff=bond_cutoffs(atoms.numbers))
+
+        adjacency = defaultdict(list)
+        for a, b in zip(i.tolist(), j.tolist()):
+            adjacency[a].append(b)
+
+        return adjacency
+
+    def _rotation_subsets(self, atoms: Atoms) -> List[np.ndarray]:
+        """
+        Indices of the atoms each rotatable bond moves.
+
+        Args:
+            atoms: Molecule
+
+        Returns:
+            One intp index array per rotatable bond, in order
+        """
+        adjacency = self._adjacency(atoms)
+        return [_subtree(adjacency, bond_begin, bond_end)
+                for bond_begin, bond_end in self.rotatable_bonds]
+
     def _apply_single_torsion(self, atoms: Atoms, bond_begin: int, bond_end: int,
-                             angle_degrees: float) -> Atoms:
+                             angle_degrees: float,
+                             adjacency: Optional[Dict[int, List[int]]] = None) -> Atoms:
         """
         Apply a single torsion rotation.
 
@@ -148,100 +312,66 @@ class TorsionHandler:
             bond_begin: Index of first atom in bond
             bond_end: Index of second atom in bond
             angle_degrees: Rotation angle in degrees
+            adjacency: Bonded neighbors of every atom (precomputed subsets
+                of the rotatable bonds are used if None)
 
         Returns:
             Modified molecule
         """
-        # Convert angle to radians
-        angle_rad = np.deg2rad(angle_degrees)
+        if adjacency is not None:
+            idx = _subtree(adjacency, bond_begin, bond_end)
+        elif (bond_begin, bond_end) in self.rotatable_bonds:
+            idx = self.rotation_subsets[self.rotatable_bonds.index((bond_begin, bond_end))]
+        else:
+            idx = _subtree(self._adjacency(atoms), bond_begin, bond_end)
 
         positions = atoms.get_positions()
+        self._rotate_torsion(positions, idx, bond_begin, bond_end, angle_degrees)
+        atoms.set_positions(positions)
+        return atoms
 
-        # Get bond axis
-        axis = positions[bond_end] - positions[bond_begin]
-        axis = axis / np.linalg.norm(axis)
+    def _rotate_torsion(self, positions: np.ndarray, idx: np.ndarray,
+                        bond_begin: int, bond_end: int, angle_degrees: float):
+        """
+        Rotate atoms about the bond_begin-bond_end axis, in place.
 
-        # Find atoms connected to bond_end (excluding bond_begin)
-        try:
-            from ase.neighborlist import neighbor_list
-            i, j = neighbor_list('ij', atoms, cutoff=1.6)
-
-            # Find neighbors of bond_end
-            neighbors_to_rotate = []
-            for idx_pair in range(len(i)):
-                if i[idx_pair] == bond_end and j[idx_pair] != bond_begin:
-                    neighbors_to_rotate.append(j[idx_pair])
-                elif j[idx_pair] == bond_end and i[idx_pair] != bond_begin:
-                    neighbors_to_rotate.append(i[idx_pair])
-
-        except:
-            logger.warning("Could not determine connected atoms for torsion")
-            return atoms
-
-        # Build set of atoms to rotate (connected to bond_end)
-        atoms_to_rotate = set(neighbors_to_rotate)
-        to_check = list(neighbors_to_rotate)
-
-        while to_check:
-            current = to_check.pop(0)
-            try:
-                from ase.neighborlist import neighbor_list
-                i, j = neighbor_list('ij', atoms, cutoff=1.6)
-
-                for idx_pair in range(len(i)):
-                    if i[idx_pair] == current and j[idx_pair] != bond_begin and j[idx_pair] != bond_end:
-                        if j[idx_pair] not in atoms_to_rotate:
-                            atoms_to_rotate.add(j[idx_pair])
-                            to_check.append(j[idx_pair])
-                    elif j[idx_pair] == current and i[idx_pair] != bond_begin and i[idx_pair] != bond_end:
-                        if i[idx_pair] not in atoms_to_rotate:
-                            atoms_to_rotate.add(i[idx_pair])
-                            to_check.append(i[idx_pair])
-            except:
-                break
-
-        # Apply rotation to selected atoms
-        rotation_matrix = self._rotation_matrix_axis_angle(axis, angle_rad)
-
-        for atom_idx in atoms_to_rotate:
-            # Translate to bond_end as origin
-            relative_pos = positions[atom_idx] - positions[bond_end]
-
-            # Rotate
-            rotated_pos = relative_pos @ rotation_matrix.T
-
-            # Translate back
-            positions[atom_idx] = rotated_pos + positions[bond_end]
+        Args:
+            positions: (N, 3) float64 molecule positions, modified in place
+            idx: Indices of the rotated atoms (see rotation_subsets)
+            bond_begin: Index of first atom in bond
+            bond_end: Index of second atom in bond
+            angle_degrees: Rotation angle in degrees
+        """
+        # Convert angle to radians
+        angle_rad = math.radians(angle_degrees)
 
-        atoms.set_positions(positions)
-        return atoms
+        # Get bond axis (unit vector)
+        axis = self._axis
+        np.subtract(positions[bond_end], positions[bond_begin], out=axis)
+        axis /= math.sqrt(axis @ axis)
+
+        # Rotate the selected atoms about bond_end (never one of them)
+        rodrigues(axis, angle_rad, self._rotation_buffer)
+        rotate_indices(positions, idx, self._rotation_buffer, positions[bond_end])
 
-    @staticmethod
-    def _rotation_matrix_axis_angle(axis: np.ndarray, angle: float) -> np.ndarray:
+    def _rotation_matrix_axis_angle(self, axis: np.ndarray, angle: float,
+                                    out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Create rotation matrix from axis and angle (Rodrigues' formula).
 
         Args:
             axis: Unit vector (rotation axis)
             angle: Rotation angle in radians
+            out: (3, 3) float64 output buffer (the handler's rotation buffer,
+                overwritten by the next torsion, if None)
 
         Returns:
-            3x3 rotation matrix
+            3x3 rotation matrix (out)
         """
-        cos_a = np.cos(angle)
-        sin_a = np.sin(angle)
-
-        # Skew-symmetric cross-product matrix
-        K = np.array([
-            [0, -axis[2], axis[1]],
-            [axis[2], 0, -axis[0]],
-            [-axis[1], axis[0], 0]
-        ])
-
-        # Rodrigues' rotation formula: R = I + sin(θ)K + (1-cos(θ))K²
-        R = np.eye(3) + sin_a * K + (1 - cos_a) @ (K @ K)
-
-        return R
+        if out is None:
+            out = self._rotation_buffer
+        rodrigues(np.asarray(axis, dtype=np.float64), angle, out)
+        return out
 
     def get_info(self) -> Dict:
         """
@@ -4,9 +4,11 @@ GOAD v1.0 - Global Optimization with ASE Design
 Main launcher integrating all workflow steps
 
 Usage:
-    python3 run_goad_v1.py
+    python3 run_goad_v1.py [--viewer {mpl,gl}]
 """
 
+import argparse
+import importlib.util
 import tkinter as tk
 from tkinter import messagebox
 import logging
@@ -30,8 +32,14 @@ from goad_v1.gui.final_optimization_window import FinalOptimizationWindow
 class GOADv1Workflow:
     """Main GOAD v1.0 workflow manager"""
 
-    def __init__(self):
-        """Initialize GOAD v1.0"""
+    def __init__(self, viewer_backend: str = "mpl"):
+        """
+        Initialize GOAD v1.0
+
+        Args:
+            viewer_backend: Structure viewer backend, "mpl" or "gl"
+        """
+        self.viewer_backend = viewer_backend
         self.root = tk.Tk()
         self.root.title("GOAD v1.0 - Global Optimization with ASE Design")
         self.root.geometry("400x200")
@@ -44,9 +52,12 @@ class GOADv1Workflow:
         self._show_analysis_window()
 
     def _setup_calculator(self):
-        """Verify that MatterSim is available"""
+        """Verify that MatterSim is installed"""
+        # Only look the package up: importing it (and torch) here would block
+        # the GUI; the reference energies window loads it in the background
         try:
-            from mattersim.forcefield import MatterSimCalculator
+            if importlib.util.find_spec("mattersim") is None:
+                raise ImportError("mattersim")
             logger.info("MatterSim is available - calculator will be selected in next step")
             self.calculator = None  # Will be set in reference energies window
 
@@ -60,26 +71,30 @@ class GOADv1Workflow:
             )
             sys.exit(1)
 
+    def _new_window(self):
+        """Toplevel window for a workflow step, sharing the one Tk root"""
+        window = tk.Toplevel(self.root)
+        window.protocol("WM_DELETE_WINDOW", lambda: self._on_window_close(window))
+        return window
+
     def _show_analysis_window(self):
         """Show analysis window"""
         self.root.withdraw()
 
-        analysis_root = tk.Tk()
+        analysis_root = self._new_window()
         analysis_window = AnalysisWindow(
             analysis_root,
-            on_complete_callback=self._on_analysis_complete
+            on_complete_callback=self._on_analysis_complete,
+            viewer_backend=self.viewer_backend
         )
 
-        analysis_root.protocol("WM_DELETE_WINDOW", self._on_window_close)
-        analysis_root.mainloop()
-
     def _on_analysis_complete(self, surface, molecule, surface_analyzer, molecule_analyzer,
                               n_fixed_layers, n_total_layers):
         """Called when analysis is complete"""
         logger.info(f"Analysis complete: {n_fixed_layers}/{n_total_layers} layers to fix")
 
         # Show reference energies window
-        ref_root = tk.Tk()
+        ref_root = self._new_window()
         ref_window = ReferenceEnergiesWindow(
             ref_root,
             surface=surface,
@@ -94,18 +109,16 @@ class GOADv1Workflow:
         # Set calculator
         ref_window.set_calculator(self.calculator)
 
-        ref_root.protocol("WM_DELETE_WINDOW", self._on_window_close)
-        ref_root.mainloop()
-
     def _on_reference_complete(self, surface_relaxed, molecule_relaxed, surface_energy,
-                              molecule_energy, n_fixed_layers, calculator):
+                              molecule_energy, n_fixed_layers, calculator,
+                              calculator_type=None):
         """Called when reference energies are calculated"""
         logger.info(f"Reference energies calculated:")
         logger.info(f"  E_surface: {surface_energy:.4f} eV")
         logger.info(f"  E_molecule: {molecule_energy:.4f} eV")
 
         # Show GA window
-        ga_root = tk.Tk()
+        ga_root = self._new_window()
         ga_window = GAWindow(
             ga_root,
             surface_relaxed=surface_relaxed,
@@ -114,18 +127,16 @@ class GOADv1Workflow:
             molecule_energy=molecule_energy,
             n_fixed_layers=n_fixed_layers,
             calculator=calculator,
-            on_complete_callback=self._on_ga_complete
+            on_complete_callback=self._on_ga_complete,
+            calculator_type=calculator_type
         )
 
-        ga_root.protocol("WM_DELETE_WINDOW", self._on_window_close)
-        ga_root.mainloop()
-
     def _on_ga_complete(self, best_structure, best_energy, n_fixed_layers, calculator):
         """Called when GA is complete"""
         logger.info(f"GA complete: Best E_ads = {best_energy:.4f} eV")
 
         # Show final optimization window
-        final_root = tk.Tk()
+        final_root = self._new_window()
 
         # Import here to avoid circular imports
         from goad_v1.analysis.surface_analyzer import SurfaceAnalyzer
@@ -141,6 +152,8 @@ class GOADv1Workflow:
             # In production, you'd track this through the workflow
             surface_analyzer_dummy = type('obj', (object,), {
                 '_info': {'layers': {'layers_list': [], 'n_layers': 0}},
+                'layers_list': [],
+                'n_layers': 0,
                 'surface': best_structure[:len(best_structure)//2]  # Rough estimate
             })()
         except:
@@ -155,25 +168,32 @@ class GOADv1Workflow:
             calculator=calculator
         )
 
-        final_root.protocol("WM_DELETE_WINDOW", self._on_window_close)
-        final_root.mainloop()
-
-    def _on_window_close(self):
-        """Handle window close"""
+    def _on_window_close(self, window):
+        """Handle window close; the workflow ends with its last window"""
         logger.info("Window closed")
-        pass
+        window.destroy()
+
+        if not any(isinstance(child, tk.Toplevel) for child in self.root.winfo_children()):
+            self.root.destroy()
 
     def run(self):
-        """Start the workflow"""
+        """Start the workflow (the only Tk main loop)"""
         self.root.mainloop()
 
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="GOAD v1.0 - Global Optimization with ASE Design")
+    parser.add_argument(
+        "--viewer", choices=("mpl", "gl"), default="mpl",
+        help="structure viewer: matplotlib (default) or OpenGL via moderngl, "
+             "which falls back to matplotlib when unavailable")
+    args = parser.parse_args()
+
     logger.info("Starting GOAD v1.0")
 
     try:
-        workflow = GOADv1Workflow()
+        workflow = GOADv1Workflow(viewer_backend=args.viewer)
         workflow.run()
     except Exception as e:
         logger.error(f"Fatal error: {e}")
@@ -0,0 +1,41 @@
+import numpy as np
+from ase.build import fcc111, molecule
+
+from goad_v1 import MoleculeAnalyzer, SurfaceAnalyzer
+
+
+def test_slab_layers_top_to_bottom():
+    """Layers are detected from the top down and partition the slab atoms."""
+    slab = fcc111('Cu', size=(2, 2, 4), vacuum=10.0)
+    info = SurfaceAnalyzer(slab).analyze()
+
+    assert info['surface_type'] == 'slab'
+    layers = info['layers']
+    assert layers['n_layers'] == 4
+
+    z = slab.get_positions()[:, 2]
+    heights = [layer['z_position'] for layer in layers['layers_list']]
+    assert heights == sorted(heights, reverse=True)
+
+    all_indices = np.concatenate([layer['atom_indices'] for layer in layers['layers_list']])
+    assert sorted(all_indices.tolist()) == list(range(len(slab)))
+    top = layers['layers_list'][0]['atom_indices']
+    assert np.allclose(z[top], z.max())
+
+
+def test_molecule_formula_and_mass():
+    """Formula, composition and mass of a small molecule."""
+    info = MoleculeAnalyzer(molecule('CH3CH2OH')).analyze()
+
+    assert info['formula'] == 'C2H6O'
+    assert info['elements'] == {'C': 2, 'H': 6, 'O': 1}
+    assert abs(info['mass'] - 46.07) < 0.01
+
+
+def test_reanalysis_reads_new_surface():
+    """analyze() uses the current surface, not the coordinates of the first run."""
+    analyzer = SurfaceAnalyzer(fcc111('Cu', size=(2, 2, 4), vacuum=10.0))
+    assert analyzer.analyze()['layers']['n_layers'] == 4
+
+    analyzer.surface = fcc111('Cu', size=(2, 2, 3), vacuum=10.0)
+    assert analyzer.analyze()['layers']['n_layers'] == 3
@@ -0,0 +1,80 @@
+import sys
+import types
+
+import numpy as np
+from ase.build import fcc111, molecule
+from ase.calculators.calculator import Calculator, all_changes
+from ase.calculators.emt import EMT
+
+from goad_v1.utils.calculator_manager import CalculatorManager
+
+
+def _emt_energy(atoms):
+    atoms = atoms.copy()
+    atoms.calc = EMT()
+    return atoms.get_potential_energy()
+
+
+class _StubPotential:
+    """Potential that predicts EMT energies, one entry per structure"""
+
+    model = types.SimpleNamespace(model_args={})
+    model_name = "m3gnet"
+
+    def predict_properties(self, dataloader, include_forces=True, include_stresses=True):
+        energies = [_emt_energy(atoms) for batch in dataloader for atoms in batch]
+        return energies, None, None
+
+
+class _StubCalculator(Calculator):
+    """Calculator whose energy is its potential's prediction"""
+
+    implemented_properties = ['energy']
+
+    def __init__(self):
+        super().__init__()
+        self.potential = _StubPotential()
+
+    def calculate(self, atoms=None, properties=('energy',), system_changes=all_changes):
+        super().calculate(atoms, properties, system_changes)
+        self.results['energy'] = _emt_energy(self.atoms)
+
+
+def _stub_build_dataloader(atoms_list, batch_size=16, **kwargs):
+    return [atoms_list[i:i + batch_size] for i in range(0, len(atoms_list), batch_size)]
+
+
+def _structures():
+    slab = fcc111('Cu', size=(2, 2, 3), vacuum=8.0)
+    structures = []
+    for height in (1.8, 2.0, 2.5):
+        co = molecule('CO')
+        co.translate(slab.positions[-1] + [0.0, 0.0, height] - co.positions[1])
+        structures.append(slab + co)
+    return structures
+
+
+def test_batch_energies_match_calculator(monkeypatch):
+    """Batched energies equal the calculator's for batchable calculator types."""
+    build = types.ModuleType("mattersim.datasets.utils.build")
+    build.build_dataloader = _stub_build_dataloader
+    monkeypatch.setitem(sys.modules, "mattersim.datasets.utils.build", build)
+
+    calc = _StubCalculator()
+    structures = _structures()
+    batched = CalculatorManager.batch_evaluate(calc, structures, batch_size=2)
+
+    single = []
+    for atoms in structures:
+        atoms = atoms.copy()
+        atoms.calc = calc
+        single.append(atoms.get_potential_energy())
+
+    assert np.allclose(batched, single)
+    assert CalculatorManager.supports_batch_evaluate("5m:bf16@cuda")
+
+
+def test_dispersion_corrected_calculators_are_not_batched():
+    """batch_evaluate skips the D3 term, so 5m_d3 is evaluated per structure."""
+    assert not CalculatorManager.supports_batch_evaluate("5m_d3")
+    assert not CalculatorManager.supports_batch_evaluate("5M+D3@cpu")
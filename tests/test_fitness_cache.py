@@ -0,0 +1,27 @@
+import numpy as np
+
+from goad_v1.utils.fitness_cache import SQLiteFitnessCache, genome_key
+
+
+def test_sqlite_cache_survives_reopening(tmp_path):
+    """Flushed entries are found again, counted as hits, after reopening the file."""
+    path = tmp_path / "fitness.sqlite"
+    key = genome_key(np.array([1.0, 2.0, 3.0, 10.0, 20.0, 30.0]))
+
+    cache = SQLiteFitnessCache(path, namespace="setup-a")
+    assert cache.get(key) is None
+    cache.put(key, -1.25)
+    cache.close()
+
+    reopened = SQLiteFitnessCache(path, namespace="setup-a")
+    assert reopened.get(key) == -1.25
+    assert key in reopened
+    assert (reopened.hits, reopened.misses) == (1, 0)
+
+    # Values of another setup are kept apart
+    other = SQLiteFitnessCache(path, namespace="setup-b")
+    assert other.get(key) is None
+    assert (other.hits, other.misses) == (0, 1)
+
+    reopened.close()
+    other.close()
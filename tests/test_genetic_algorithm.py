@@ -0,0 +1,75 @@
+import logging
+
+import numpy as np
+from ase.build import fcc111, molecule
+from ase.calculators.emt import EMT
+
+from goad_v1.ga.genetic_algorithm import GeneticAlgorithm
+from goad_v1.utils.fitness_cache import LRUCache
+
+
+def _setup():
+    """Small Cu slab, CO and their EMT reference energies"""
+    slab = fcc111('Cu', size=(2, 2, 3), vacuum=8.0)
+    co = molecule('CO')
+    calc = EMT()
+    energies = []
+    for atoms in (slab, co):
+        atoms = atoms.copy()
+        atoms.calc = calc
+        energies.append(atoms.get_potential_energy())
+    return slab, co, calc, energies
+
+
+def _run(**kwargs):
+    slab, co, calc, (e_slab, e_co) = _setup()
+    ga = GeneticAlgorithm(slab, co, calc, e_slab, e_co, generations=2, population_size=6,
+                          elite_size=2, seed=1, verbose=False, **kwargs)
+    return ga, ga.run()
+
+
+def test_broken_worker_pool_falls_back_to_serial(caplog):
+    """Workers that cannot build their calculator do not stop the run."""
+    # An unknown calculator type makes every worker initializer raise
+    with caplog.at_level(logging.WARNING, logger='goad_v1.ga.genetic_algorithm'):
+        ga, results = _run(n_workers=2, calculator_spec="no-such-calculator")
+    _, serial = _run(n_workers=1)
+
+    assert "Worker pool failed, evaluating serially" in caplog.text
+    assert ga._executor is None
+    assert np.all(results['fitness_history'] < 1000.0)
+    assert np.isclose(results['best_energy'], serial['best_energy'])
+
+
+class _FailingEMT(EMT):
+    """EMT that fails for every system containing the molecule"""
+
+    def calculate(self, atoms=None, properties=('energy',), system_changes=()):
+        if 'O' in atoms.get_chemical_symbols():
+            raise RuntimeError("transient failure")
+        super().calculate(atoms, properties, system_changes)
+
+
+def test_failed_calculations_are_not_cached():
+    """Penalized failures do not end up in the fitness cache."""
+    slab, co, _, (e_slab, e_co) = _setup()
+    cache = LRUCache()
+    ga = GeneticAlgorithm(slab, co, _FailingEMT(), e_slab, e_co, generations=2,
+                          population_size=6, elite_size=2, seed=1, cache=cache,
+                          verbose=False)
+    results = ga.run()
+
+    assert np.all(results['fitness_history'] == 1000.0)
+    assert len(cache) == 0
+
+
+def test_short_batch_results_are_penalized(caplog):
+    """A batch hook that drops energies fails the batch instead of misaligning it."""
+    def short_batch(systems):
+        return [-1.0] * (len(systems) - 1)
+
+    with caplog.at_level(logging.WARNING, logger='goad_v1.ga.genetic_algorithm'):
+        _, results = _run(batch_evaluate=short_batch)
+
+    assert "got 5 energies for 6 systems" in caplog.text
+    assert np.all(results['fitness_history'] == 1000.0)
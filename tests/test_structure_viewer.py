@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from goad_v1.gui import gl_structure_viewer, structure_viewer
+
+
+class _Frame:
+    """Stand-in for a Tk frame that records its child widgets"""
+
+    def __init__(self):
+        self.children = []
+
+
+class _Widget:
+    """Stand-in for a Tk widget packed into a _Frame"""
+
+    def __init__(self, master=None, **kwargs):
+        self.master = master
+        if master is not None:
+            master.children.append(self)
+
+    def pack(self, **kwargs):
+        pass
+
+    def configure(self, **kwargs):
+        pass
+
+    def bind(self, *args):
+        pass
+
+    def destroy(self):
+        self.master.children.remove(self)
+
+
+class _Canvas:
+    """Stand-in for FigureCanvasTkAgg"""
+
+    def __init__(self, figure, master):
+        self.widget = _Widget(master)
+
+    def get_tk_widget(self):
+        return self.widget
+
+    def draw_idle(self):
+        pass
+
+
+def test_gl_fallback_leaves_only_matplotlib_widgets(monkeypatch):
+    """Without an OpenGL context the frame holds just the matplotlib canvas."""
+    def no_context(*args):
+        raise RuntimeError("no OpenGL 3.3 context")
+
+    monkeypatch.setattr(gl_structure_viewer, 'HAS_MODERNGL', True)
+    monkeypatch.setattr(gl_structure_viewer, '_SphereRenderer', no_context)
+    monkeypatch.setattr(gl_structure_viewer.tk, 'Label', _Widget)
+    monkeypatch.setattr(gl_structure_viewer.tk, 'PhotoImage', _Widget)
+    monkeypatch.setattr(gl_structure_viewer.ttk, 'Label', _Widget)
+    monkeypatch.setattr(structure_viewer, 'FigureCanvasTkAgg', _Canvas)
+
+    frame = _Frame()
+    viewer = structure_viewer.create_structure_viewer(frame, backend="gl", width=3, height=2)
+
+    assert isinstance(viewer, structure_viewer.StructureViewer)
+    assert frame.children == [viewer.canvas_widget]
+
+
+def test_gl_renderer_draws_atoms():
+    """The offscreen renderer returns an image with the atoms drawn."""
+    pytest.importorskip('moderngl')
+    try:
+        renderer = gl_structure_viewer._SphereRenderer(80, 60)
+    except Exception as e:
+        pytest.skip(f"No OpenGL context: {e}")
+
+    positions = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 3.0]])
+    colors = np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]], dtype=np.float32)
+    renderer.set_scene(positions, np.full(2, 0.8), colors, np.zeros((2, 3), dtype=np.float32),
+                       segments=positions[None])
+    image = renderer.render(elev=0, azim=0)
+
+    assert image.shape == (60, 80, 3)
+    # Upper atom (blue) above the lower one (red), on a white background
+    blue_rows = np.nonzero((image[..., 2] > 150) & (image[..., 0] < 100))[0]
+    red_rows = np.nonzero((image[..., 0] > 150) & (image[..., 2] < 100))[0]
+    assert blue_rows.mean() < red_rows.mean()
+    assert (image == 255).all(axis=2).any()
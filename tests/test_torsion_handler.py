@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from ase.build import molecule
+
+from goad_v1.utils import torsion_handler
+from goad_v1.utils.torsion_handler import TorsionHandler
+
+
+def test_neighbor_list_failure_reaches_caller(monkeypatch):
+    """A failed bond search raises instead of leaving torsions that move nothing."""
+    def fail(*args, **kwargs):
+        raise RuntimeError("neighbor list failed")
+
+    monkeypatch.setattr(torsion_handler, 'neighbor_list', fail)
+    with pytest.raises(RuntimeError, match="neighbor list failed"):
+        TorsionHandler(molecule('CH3CH2OH'))
+
+
+def test_batch_matches_single_torsions():
+    """Batched torsions give the same positions as one molecule at a time."""
+    butane = molecule('trans-butane')
+    handler = TorsionHandler(butane)
+    angles = np.random.default_rng(0).uniform(0, 360, size=(5, handler.n_torsions))
+
+    batch = handler.apply_torsions_batch(butane.get_positions(), angles)
+    single = [handler.apply_torsions(butane.copy(), row).get_positions() for row in angles]
+    assert np.allclose(batch, single)